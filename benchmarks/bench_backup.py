@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Backup and device-info throughput benchmark against a simulated device.
+
+Runs DeviceInfoTask and core.acquisition.BackupTask in-process
+against benchmarks/fake_device.py and reports MB/s, files/s, peak RSS and
+time-to-first-byte. No iPhone is required.
+
+Usage:
+    python benchmarks/bench_backup.py --shape mixed --files 2000 --total-size 512M
+    python benchmarks/bench_backup.py --shape small --files 20000 --hash --json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fake_device  # noqa: E402
+
+
+def parse_size(text):
+    units = {'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3}
+    text = text.strip().lower()
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None if unknown."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _run_task(task):
+    """Run a core task synchronously and collect what it reported."""
+    from idevice_manager.core.acquisition import TaskListener
+
+    emitted = {'finished': None, 'log': [], 'progress': None}
+
+    class Collector(TaskListener):
+        def log(self, message):
+            emitted['log'].append(message)
+
+        def backup_progress(self, progress):
+            emitted['progress'] = progress
+
+        def finished(self, message):
+            emitted['finished'] = message
+
+    task.listener = Collector()
+    start = time.perf_counter()
+    task.run()
+    emitted['elapsed'] = time.perf_counter() - start
+    return emitted
+
+
+def bench_device_info(app, device_io):
+    from PyQt6.QtCore import QCoreApplication
+    task = app.DeviceInfoTask(device_io)
+    emitted = {'finished': None, 'info': None}
+    task.task_finished.connect(lambda message: emitted.__setitem__('finished', message))
+    task.device_info_ready.connect(lambda info: emitted.__setitem__('info', info))
+    start = time.perf_counter()
+    task.start().result()
+    elapsed = time.perf_counter() - start
+    QCoreApplication.processEvents()  # deliver the signals queued from the loop thread
+    return {
+        'elapsed_s': round(elapsed, 4),
+        'result': emitted['finished'],
+        'screenshot': bool(emitted['info'] and emitted['info'].get('screenshot_image')),
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def bench_backup(backup_directory, args):
+    from idevice_manager.core import acquisition
+
+    first_byte = {}
+    original_on_file_chunk = acquisition._BackupEventListener.on_file_chunk
+
+    def on_file_chunk(self, file_name, nbytes):
+        first_byte.setdefault('t', time.perf_counter())
+        original_on_file_chunk(self, file_name, nbytes)
+
+    acquisition._BackupEventListener.on_file_chunk = on_file_chunk
+    try:
+        hash_algorithms = ('sha256',) if args.hash else None
+        task = acquisition.BackupTask(backup_directory, incremental=args.incremental,
+                                      hash_algorithms=hash_algorithms)
+        start = time.perf_counter()
+        emitted = _run_task(task)
+    finally:
+        acquisition._BackupEventListener.on_file_chunk = original_on_file_chunk
+
+    progress = emitted['progress']
+    elapsed = emitted['elapsed']
+    bytes_done = progress.bytes_done if progress else 0
+    files_done = progress.files_done if progress else 0
+    return {
+        'elapsed_s': round(elapsed, 3),
+        'result': emitted['finished'],
+        'files': files_done,
+        'bytes': bytes_done,
+        'mb_per_s': round(bytes_done / elapsed / (1024 * 1024), 2) if elapsed else None,
+        'files_per_s': round(files_done / elapsed, 1) if elapsed else None,
+        'time_to_first_byte_s': round(first_byte['t'] - start, 4) if first_byte else None,
+        'peak_rss_mb': peak_rss_mb(),
+        'errors': [line for line in emitted['log'] if line.startswith('[ERROR]')],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--shape', choices=sorted(fake_device.SHAPES), default='mixed')
+    parser.add_argument('--files', type=int, default=2000)
+    parser.add_argument('--total-size', type=parse_size, default=None,
+                        help='scale the tree to this many bytes (e.g. 512M)')
+    parser.add_argument('--chunk-size', type=parse_size, default=256 * 1024,
+                        help='size of the data blocks the device sends')
+    parser.add_argument('--repeat', type=int, default=1, help='number of backup runs')
+    parser.add_argument('--incremental', action='store_true', help='seed runs after the first')
+    parser.add_argument('--hash', action='store_true', help='enable the integrity manifest stage')
+    parser.add_argument('--keep', action='store_true', help='keep the backup directory')
+    parser.add_argument('--json', action='store_true', help='print a JSON report only')
+    args = parser.parse_args(argv)
+
+    from PyQt6.QtCore import QCoreApplication
+    import idevice_manager.main as app
+    from idevice_manager.core.aio import DeviceIO
+
+    qt_app = QCoreApplication.instance() or QCoreApplication(sys.argv)  # noqa: F841
+    tree = fake_device.synthetic_tree(args.files, args.shape, args.total_size)
+    report = {
+        'tree': {'shape': args.shape, 'files': len(tree), 'bytes': sum(f.size for f in tree)},
+        'device_info': None,
+        'backups': [],
+    }
+    backup_directory = tempfile.mkdtemp(prefix='idevice-bench-')
+    try:
+        with fake_device.FakeDeviceServer(tree, chunk_size=args.chunk_size) as server:
+            fake_device.install(server)
+            device_io = DeviceIO()
+            try:
+                report['device_info'] = bench_device_info(app, device_io)
+            finally:
+                device_io.stop()
+            for index in range(args.repeat):
+                report['backups'].append(bench_backup(backup_directory, args))
+    finally:
+        if args.keep:
+            report['backup_directory'] = backup_directory
+        else:
+            shutil.rmtree(backup_directory, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    tree_info = report['tree']
+    print(f"Tree: {tree_info['files']} files, {tree_info['bytes'] / 1024 ** 2:.1f} MB ({tree_info['shape']})")
+    info = report['device_info']
+    print(f"device-info: {info['elapsed_s'] * 1000:.1f} ms  ({info['result']})")
+    for index, run in enumerate(report['backups'], 1):
+        rss = f"{run['peak_rss_mb']:.0f} MB" if run['peak_rss_mb'] is not None else 'n/a'
+        print(f"backup #{index}: {run['elapsed_s']:.2f} s  {run['mb_per_s']} MB/s  {run['files_per_s']} files/s  "
+              f"TTFB {run['time_to_first_byte_s']} s  peak RSS {rss}  ({run['result']})")
+        for error in run['errors']:
+            print(f"    {error}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the GUI.
+
+Starts a fresh interpreter per run and measures how long it takes to
+import idevice_manager.main, to paint the license dialog, to paint the
+main window and to have the device services up. Also reports which heavy
+packages were already loaded at first paint. No iPhone is required; on
+Linux without a display Qt's offscreen platform is used.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 5
+    python benchmarks/bench_startup.py --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Packages whose presence at first paint means startup paid for them
+HEAVY_MODULES = ('PIL.Image', 'pymobiledevice3.lockdown', 'pymobiledevice3.services.mobilebackup2')
+
+# Runs in the child interpreter; prints one JSON line
+CHILD = r'''
+import time
+t0 = time.perf_counter()
+import json, sys
+import idevice_manager.main as app
+from PyQt6.QtCore import QEvent, QObject
+t_import = time.perf_counter()
+
+HEAVY_MODULES = %(heavy)r
+marks = {}
+
+
+class PaintWatcher(QObject):
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and self.name not in marks:
+            marks[self.name] = time.perf_counter()
+            marks[self.name + '_heavy'] = [name for name in HEAVY_MODULES if name in sys.modules]
+        return False
+
+
+def wait_for(name, timeout=30):
+    deadline = time.perf_counter() + timeout
+    while name not in marks and time.perf_counter() < deadline:
+        qt_app.processEvents()
+        time.sleep(0.001)
+
+
+qt_app = app.QApplication(sys.argv)
+dialog = app.LicenseDialog()
+dialog_watcher = PaintWatcher('license')
+dialog.installEventFilter(dialog_watcher)
+dialog.show()
+wait_for('license')
+dialog.accept()
+
+window = app.BackupApp()
+window_watcher = PaintWatcher('window')
+window.installEventFilter(window_watcher)
+window.show()
+wait_for('window')
+deadline = time.perf_counter() + 30
+while window.device_monitor is None and time.perf_counter() < deadline:
+    qt_app.processEvents()
+    time.sleep(0.001)
+t_ready = time.perf_counter()
+window.close()
+
+print(json.dumps({
+    'import_s': t_import - t0,
+    'license_paint_s': marks.get('license', t_ready) - t0,
+    'window_paint_s': marks.get('window', t_ready) - t0,
+    'services_ready_s': t_ready - t0,
+    'loaded_at_license_paint': marks.get('license_heavy', []),
+    'loaded_at_window_paint': marks.get('window_heavy', []),
+}))
+'''
+
+
+def run_once(env):
+    child = CHILD % {'heavy': HEAVY_MODULES}
+    result = subprocess.run([sys.executable, '-c', child], env=env, cwd=ROOT, capture_output=True, text=True,
+                            timeout=120)
+    if result.returncode != 0:
+        raise RuntimeError(f"startup run failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=5, help='number of cold starts')
+    parser.add_argument('--json', action='store_true', help='print a JSON report only')
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+    if sys.platform.startswith('linux') and not (env.get('DISPLAY') or env.get('WAYLAND_DISPLAY')):
+        env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    with tempfile.TemporaryDirectory(prefix='idevice-startup-') as data_home:
+        # Keep the benchmark's log and caches out of the user's app data
+        env['XDG_DATA_HOME'] = data_home
+        env['APPDATA'] = data_home
+        runs = [run_once(env) for _ in range(args.runs)]
+
+    timings = ('import_s', 'license_paint_s', 'window_paint_s', 'services_ready_s')
+    report = {
+        'runs': runs,
+        'median': {key: round(statistics.median(run[key] for run in runs), 4) for key in timings},
+        'min': {key: round(min(run[key] for run in runs), 4) for key in timings},
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"{args.runs} cold starts (median / min):")
+    for key in timings:
+        print(f"  {key[:-2].replace('_', ' '):<16} {report['median'][key] * 1000:7.0f} ms / "
+              f"{report['min'][key] * 1000:.0f} ms")
+    print(f"  loaded at license paint: {', '.join(runs[-1]['loaded_at_license_paint']) or 'none'}")
+    print(f"  loaded at window paint:  {', '.join(runs[-1]['loaded_at_window_paint']) or 'none'}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,340 @@
+"""
+Simulated iOS device for benchmarks.
+
+A separate process serves the mobilebackup2 device link and SpringBoard
+services on local TCP ports, using the same length-prefixed plist and file
+transfer framing as a real device. The client side (pymobiledevice3's
+ServiceConnection and our backup engine) talks to it unmodified.
+
+usbmux discovery and the lockdown session are replaced by in-process
+fakes that hand out connections to those ports. The AFC lock and
+Info.plist prelude of Mobilebackup2Service.backup() is skipped, since it
+needs AFC, installation proxy and notification proxy servers that do not
+affect transfer throughput.
+"""
+
+import hashlib
+import io
+import multiprocessing
+import os
+import plistlib
+import random
+import socketserver
+import sqlite3
+import struct
+import sys
+import tempfile
+import threading
+from collections import namedtuple
+from datetime import datetime
+from pathlib import Path
+
+FAKE_UDID = '00008030-00FA4E0A3C38802E'
+DL_VERSION = 300
+SUPPORTED_PROTOCOL_VERSION = 2.1
+
+SyntheticFile = namedtuple('SyntheticFile', ['domain', 'relative_path', 'file_id', 'size'])
+
+# Synthetic tree shapes: name -> file size sampler
+SHAPES = {
+    'small': lambda rng: rng.randint(512, 16 * 1024),
+    'mixed': lambda rng: int(min(rng.lognormvariate(10, 2.2), 512 * 1024 * 1024)),
+    'large': lambda rng: rng.randint(64, 256) * 1024 * 1024,
+}
+
+DOMAINS = ['HomeDomain', 'MediaDomain', 'CameraRollDomain', 'AppDomain-com.example.notes',
+           'AppDomainGroup-group.com.example.shared', 'KeychainDomain', 'WirelessDomain']
+
+
+def synthetic_tree(files=1000, shape='mixed', total_bytes=None, seed=1):
+    """Deterministic list of SyntheticFile entries.
+
+    When total_bytes is given the sampled sizes are scaled to add up to it.
+    """
+    rng = random.Random(seed)
+    sampler = SHAPES[shape]
+    sizes = [sampler(rng) for _ in range(files)]
+    if total_bytes:
+        scale = total_bytes / max(sum(sizes), 1)
+        sizes = [max(1, int(size * scale)) for size in sizes]
+    tree = []
+    for index, size in enumerate(sizes):
+        domain = DOMAINS[index % len(DOMAINS)]
+        relative_path = f"Library/Bench/{index // 100:04d}/file{index:07d}.bin"
+        file_id = hashlib.sha1(f"{domain}-{relative_path}".encode()).hexdigest()
+        tree.append(SyntheticFile(domain, relative_path, file_id, size))
+    return tree
+
+
+def _manifest_db(tree):
+    """Bytes of a minimal Manifest.db describing the synthetic tree."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'Manifest.db')
+        connection = sqlite3.connect(path)
+        connection.execute(
+            "CREATE TABLE Files (fileID TEXT PRIMARY KEY, domain TEXT, relativePath TEXT, flags INTEGER, file BLOB)"
+        )
+        connection.executemany(
+            "INSERT INTO Files VALUES (?, ?, ?, 1, ?)",
+            [(f.file_id, f.domain, f.relative_path, plistlib.dumps({'Size': f.size}, fmt=plistlib.FMT_BINARY))
+             for f in tree]
+        )
+        connection.commit()
+        connection.close()
+        with open(path, 'rb') as fd:
+            return fd.read()
+
+
+# --- Wire helpers (device side) ---
+
+def _recv_exact(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("client closed the connection")
+        data += chunk
+    return bytes(data)
+
+
+def _send_plist(sock, obj):
+    payload = plistlib.dumps(obj, fmt=plistlib.FMT_BINARY)
+    sock.sendall(struct.pack('>L', len(payload)) + payload)
+
+
+def _recv_plist(sock):
+    size, = struct.unpack('>L', _recv_exact(sock, 4))
+    return plistlib.loads(_recv_exact(sock, size))
+
+
+def _send_prefixed(sock, text):
+    data = text.encode()
+    sock.sendall(struct.pack('>I', len(data)) + data)
+
+
+class _BackupHandler(socketserver.BaseRequestHandler):
+    """Device side of a mobilebackup2 full backup."""
+
+    def handle(self):
+        sock = self.request
+        config = self.server.config
+        udid = config['udid']
+
+        _send_plist(sock, ['DLMessageVersionExchange', DL_VERSION, 0])
+        _recv_plist(sock)  # DLVersionsOk
+        _send_plist(sock, ['DLMessageDeviceReady'])
+        _recv_plist(sock)  # Hello
+        _send_plist(sock, ['DLMessageProcessMessage', {
+            'ErrorCode': 0, 'MessageName': 'Response', 'ProtocolVersion': SUPPORTED_PROTOCOL_VERSION,
+        }])
+        _recv_plist(sock)  # Backup request
+
+        tree = config['tree']
+        for prefix in sorted({f.file_id[:2] for f in tree}):
+            _send_plist(sock, ['DLMessageCreateDirectory', f'{udid}/{prefix}'])
+            _recv_plist(sock)
+
+        total = sum(f.size for f in tree) or 1
+        sent = 0
+        batch_size = config['batch_size']
+        for start in range(0, len(tree), batch_size):
+            batch = tree[start:start + batch_size]
+            _send_plist(sock, ['DLMessageUploadFiles', {}, 100.0 * sent / total])
+            for synthetic_file in batch:
+                self._send_file(sock, f'{synthetic_file.domain}-{synthetic_file.relative_path}',
+                                f'{udid}/{synthetic_file.file_id[:2]}/{synthetic_file.file_id}',
+                                synthetic_file.size)
+                sent += synthetic_file.size
+            sock.sendall(struct.pack('>I', 0))
+            _recv_plist(sock)  # status response
+
+        # Metadata last, as a real device does
+        _send_plist(sock, ['DLMessageUploadFiles', {}, 100.0])
+        for name, data in config['metadata'].items():
+            self._send_file(sock, name, f'{udid}/{name}', len(data), data)
+        sock.sendall(struct.pack('>I', 0))
+        _recv_plist(sock)
+
+        _send_plist(sock, ['DLMessageProcessMessage', {'ErrorCode': 0, 'Content': 'Backup finished'}])
+        try:
+            _recv_plist(sock)  # DLMessageDisconnect
+        except ConnectionError:
+            pass
+
+    def _send_file(self, sock, device_name, file_name, size, data=None):
+        config = self.server.config
+        pattern = memoryview(config['pattern'])
+        chunk_size = config['chunk_size']
+        _send_prefixed(sock, device_name)
+        _send_prefixed(sock, file_name)
+        offset = 0
+        while offset < size:
+            length = min(chunk_size, size - offset)
+            block = data[offset:offset + length] if data is not None else pattern[:length]
+            sock.sendall(struct.pack('>IB', length + 1, 0x0c))
+            sock.sendall(block)
+            offset += length
+        sock.sendall(struct.pack('>IB', 1, 0x00))
+
+
+class _SpringBoardHandler(socketserver.BaseRequestHandler):
+    """Answers the SpringBoard requests used by the device info panel."""
+
+    def handle(self):
+        sock = self.request
+        while True:
+            try:
+                request = _recv_plist(sock)
+            except ConnectionError:
+                return
+            command = request.get('command')
+            if command == 'getInterfaceOrientation':
+                _send_plist(sock, {'interfaceOrientation': 1})
+            elif command == 'getHomeScreenWallpaperPNGData':
+                _send_plist(sock, {'pngData': self.server.config['wallpaper']})
+            else:
+                _send_plist(sock, {})
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, handler, config):
+        super().__init__(('127.0.0.1', 0), handler)
+        self.config = config
+
+
+def _wallpaper_png(width, height):
+    from PIL import Image
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), (40, 90, 160)).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def _serve(connection, tree, udid, chunk_size, batch_size, wallpaper_size):
+    status = plistlib.dumps({
+        'SnapshotState': 'finished', 'BackupState': 'new', 'IsFullBackup': True,
+        'Version': '3.3', 'Date': datetime.now(), 'UUID': udid,
+    }, fmt=plistlib.FMT_BINARY)
+    config = {
+        'udid': udid,
+        'tree': tree,
+        'chunk_size': chunk_size,
+        'batch_size': batch_size,
+        'pattern': os.urandom(chunk_size),
+        'metadata': {'Manifest.db': _manifest_db(tree), 'Status.plist': status},
+        'wallpaper': _wallpaper_png(*wallpaper_size),
+    }
+    servers = {
+        'mobilebackup2': _Server(_BackupHandler, config),
+        'springboard': _Server(_SpringBoardHandler, config),
+    }
+    for server in servers.values():
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    connection.send({name: server.server_address[1] for name, server in servers.items()})
+    connection.recv()  # block until asked to stop
+    for server in servers.values():
+        server.shutdown()
+
+
+class FakeDeviceServer:
+    """Runs the simulated device services in a child process."""
+
+    def __init__(self, tree, udid=FAKE_UDID, chunk_size=256 * 1024, batch_size=64,
+                 wallpaper_size=(1290, 2796)):
+        self.udid = udid
+        self.tree = tree
+        self._connection, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_serve, args=(child, tree, udid, chunk_size, batch_size, wallpaper_size), daemon=True
+        )
+        self.ports = None
+
+    def __enter__(self):
+        self._process.start()
+        self.ports = self._connection.recv()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._connection.send('stop')
+        self._process.join(timeout=5)
+
+
+# --- Client side fakes ---
+
+class FakeMuxDevice:
+    def __init__(self, serial, devid=1):
+        self.devid = devid
+        self.serial = serial
+        self.connection_type = 'USB'
+
+    def __repr__(self):
+        return f"<FakeMuxDevice serial={self.serial}>"
+
+
+class FakeLockdown:
+    """Lockdown session stand-in that connects services to FakeDeviceServer."""
+
+    def __init__(self, server):
+        self.server = server
+        self.udid = self.identifier = server.udid
+        self.all_values = {
+            'DeviceName': 'Bench iPhone', 'ProductVersion': '17.4', 'BuildVersion': '21E219',
+            'SerialNumber': 'BENCH0000001', 'UniqueDeviceID': server.udid, 'ProductType': 'iPhone15,3',
+            'DeviceClass': 'iPhone', 'TrustedHostAttached': True,
+        }
+        self.domain_values = {
+            'com.apple.mobile.battery': {'BatteryCurrentCapacity': 87, 'BatteryIsCharging': True},
+            'com.apple.disk_usage': {'TotalDataCapacity': 128 * 1024 ** 3, 'TotalDataAvailable': 64 * 1024 ** 3},
+        }
+
+    def get_value(self, domain=None, key=None):
+        values = self.domain_values.get(domain, {}) if domain else self.all_values
+        return dict(values) if key is None else values.get(key)
+
+    def start_lockdown_service(self, name, include_escrow_bag=False):
+        from pymobiledevice3.exceptions import StartServiceError
+        from pymobiledevice3.service_connection import ServiceConnection
+        # FakeLockdown is not a LockdownClient, so services ask for their RSD (".shim.remote") names
+        for prefix, port_name in (('com.apple.mobilebackup2', 'mobilebackup2'),
+                                  ('com.apple.springboardservices', 'springboard')):
+            if name.startswith(prefix):
+                return ServiceConnection.create_using_tcp('127.0.0.1', self.server.ports[port_name])
+        # e.g. screenshotr, which needs the developer disk image
+        raise StartServiceError(name, "not available on the simulated device")
+
+    start_lockdown_developer_service = start_lockdown_service
+
+    def close(self):
+        pass
+
+
+def _backup_without_prelude(self, full=True, backup_directory='.', progress_callback=lambda x: None):
+    device_directory = Path(backup_directory) / self.lockdown.udid
+    device_directory.mkdir(exist_ok=True, parents=True)
+    with self.device_link(Path(backup_directory)) as dl:
+        dl.send_process_message({'MessageName': 'Backup', 'TargetIdentifier': self.lockdown.udid})
+        dl.dl_loop(progress_callback)
+
+
+def install(server):
+    """Point idevice_manager's device entry points at the fake device."""
+    from pymobiledevice3 import lockdown, usbmux
+    from idevice_manager.core import acquisition, connections, discovery
+    from idevice_manager.core.backup import StreamingBackupService
+
+    device = FakeMuxDevice(server.udid)
+    fakes = {
+        'select_device': lambda udid=None, **kwargs: device if udid in (None, server.udid) else None,
+        'list_devices': lambda *args, **kwargs: [device],
+        'create_using_usbmux': lambda serial=None, **kwargs: FakeLockdown(server),
+    }
+    # The GUI and the command line are patched only when loaded, so neither pulls in the other.
+    # pymobiledevice3 itself is patched for code that imports these on first use.
+    for module in (usbmux, lockdown, acquisition, connections, discovery, sys.modules.get('idevice_manager.main'),
+                   sys.modules.get('idevice_manager.cli')):
+        for name, fake in fakes.items():
+            if module is not None and hasattr(module, name):
+                setattr(module, name, fake)
+    StreamingBackupService.backup = _backup_without_prelude
@@ -8,6 +8,12 @@ __version__ = "1.0.0"
 __author__ = "Veritas Digital Forensics LLC"
 __license__ = "GPL-3.0"
 
-from .main import main
+__all__ = ["main"]
 
-__all__ = ["main"]
\ No newline at end of file
+
+def __getattr__(name):
+    # Resolved lazily so the core package can be imported without loading the GUI
+    if name == "main":
+        from .main import main
+        return main
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,234 @@
+"""
+Headless command line front end.
+
+Runs the same device tasks as the GUI without importing PyQt6, so
+acquisitions can be scripted and run on machines without a display:
+
+    idevice-manager-cli list
+    idevice-manager-cli device-info --all-devices --json
+    idevice-manager-cli backup /evidence --all-devices --jobs 4 --hash --json
+
+Status lines go to stderr (prefixed with the device when several are
+handled at once); with --json the results go to stdout as one JSON
+document. The exit status is 1 if any device failed.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Allow running this file directly as a script as well as with -m
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymobiledevice3.usbmux import list_devices
+
+from idevice_manager import __version__
+from idevice_manager.core.acquisition import BackupTask, InfoTask, TaskListener
+from idevice_manager.core.aio import DeviceIO
+from idevice_manager.core.capture import encode_png
+from idevice_manager.core.discovery import attached_udids
+from idevice_manager.core.hashing import DEFAULT_ALGORITHMS, LEGACY_ALGORITHMS
+
+_print_lock = threading.Lock()
+
+
+class _ConsoleListener(TaskListener):
+    """Prints a task's status lines to stderr."""
+
+    def __init__(self, prefix='', quiet=False):
+        self.prefix = prefix
+        self.quiet = quiet
+
+    def log(self, message):
+        # Errors are always shown, even with --quiet
+        if self.quiet and not message.startswith('[ERROR]'):
+            return
+        with _print_lock:
+            print(f"{self.prefix}{message}", file=sys.stderr, flush=True)
+
+    def finished(self, message):
+        self.log(message)
+
+
+def _target_udids(args):
+    """The devices a command runs on: every USB device, or the requested (or first) one."""
+    if args.all_devices:
+        return attached_udids()
+    return [args.udid]
+
+
+def _listener_for(udid, args, count):
+    prefix = f"[{udid[:8]}] " if count > 1 and udid else ''
+    return _ConsoleListener(prefix, args.quiet)
+
+
+def _emit(results, args, describe):
+    if args.json:
+        json.dump(results, sys.stdout, indent=2, default=str)
+        sys.stdout.write('\n')
+    else:
+        for result in results:
+            print(describe(result))
+    return 0 if results and all(result.get('ok') for result in results) else 1
+
+
+# --- Commands ---
+def cmd_list(args):
+    devices = [{'udid': device.serial, 'connection_type': device.connection_type} for device in list_devices()]
+    if args.json:
+        json.dump(devices, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        for device in devices:
+            print(f"{device['udid']}\t{device['connection_type']}")
+    return 0
+
+
+class _ImageSaver(_ConsoleListener):
+    """Also writes the device picture (PNG, from InfoTask's image_factory) to directory."""
+
+    def __init__(self, directory, prefix='', quiet=False):
+        super().__init__(prefix, quiet)
+        self.directory = directory
+        self.path = None
+
+    def device_info(self, info):
+        data = info.get('screenshot_image')
+        if data:
+            os.makedirs(self.directory, exist_ok=True)
+            self.path = os.path.join(self.directory, f"{info['UniqueDeviceID']}.png")
+            with open(self.path, 'wb') as fd:
+                fd.write(data)
+            self.log(f"Device image saved to: {self.path}")
+
+
+def cmd_device_info(args):
+    udids = _target_udids(args)
+    if not udids:
+        print("[ERROR] No device connected.", file=sys.stderr)
+        return 1
+
+    async def run_one(udid, semaphore):
+        listener = _listener_for(udid, args, len(udids))
+        if args.screenshot_dir:
+            listener = _ImageSaver(args.screenshot_dir, listener.prefix, listener.quiet)
+        task = InfoTask(io, udid, capture=bool(args.screenshot_dir), image_factory=encode_png, listener=listener)
+        async with semaphore:
+            await task.run()
+        result = dict(task.result, udid=task.result.get('udid') or udid)
+        if getattr(listener, 'path', None):
+            result['screenshot'] = listener.path
+        return result
+
+    async def run_all():
+        semaphore = asyncio.Semaphore(args.jobs)
+        return await asyncio.gather(*(run_one(udid, semaphore) for udid in udids))
+
+    io = DeviceIO()
+    try:
+        results = io.run(run_all())
+    finally:
+        io.stop()
+
+    def describe(result):
+        info = result.get('info')
+        if not info:
+            return f"{result['udid'] or 'device'}: {result['message']}"
+        return (f"{info['UniqueDeviceID']}: {info['DeviceName']} ({info['ProductType']}, "
+                f"iOS {info['ProductVersion']}, serial {info['SerialNumber']})")
+
+    return _emit(list(results), args, describe)
+
+
+def cmd_backup(args):
+    udids = _target_udids(args)
+    if not udids:
+        print("[ERROR] No device connected.", file=sys.stderr)
+        return 1
+    hash_algorithms = None
+    if args.hash or args.legacy_hashes:
+        hash_algorithms = LEGACY_ALGORITHMS if args.legacy_hashes else DEFAULT_ALGORITHMS
+
+    def run_one(udid):
+        task = BackupTask(args.directory, udid=udid, incremental=args.incremental, deduplicate=args.dedup,
+                          hash_algorithms=hash_algorithms, listener=_listener_for(udid, args, len(udids)))
+        task.run()
+        return dict(task.result, udid=task.result.get('udid') or udid)
+
+    # Each backup blocks on its own device link, so they get a thread each
+    with ThreadPoolExecutor(max_workers=args.jobs, thread_name_prefix='backup') as executor:
+        results = list(executor.map(run_one, udids))
+
+    def describe(result):
+        return f"{result['udid'] or 'device'}: {result.get('message')}"
+
+    return _emit(results, args, describe)
+
+
+# --- Argument Parsing ---
+def _positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return value
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='idevice-manager-cli', description=__doc__.strip().split('\n\n')[0])
+    parser.add_argument('--version', action='version', version=f"%(prog)s {__version__}")
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--json', action='store_true', help='print the results as JSON on stdout')
+    common.add_argument('-q', '--quiet', action='store_true', help='only print errors to stderr')
+
+    targets = argparse.ArgumentParser(add_help=False)
+    group = targets.add_mutually_exclusive_group()
+    group.add_argument('--udid', help='device to use (default: the first one found)')
+    group.add_argument('--all-devices', action='store_true', help='run on every attached USB device')
+    targets.add_argument('-j', '--jobs', type=_positive_int, default=1,
+                         help='devices handled at the same time (default: 1)')
+
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    list_parser = commands.add_parser('list', parents=[common], help='list attached devices')
+    list_parser.set_defaults(handler=cmd_list)
+
+    info_parser = commands.add_parser('device-info', parents=[common, targets], help='show device properties')
+    info_parser.add_argument('--screenshot-dir', metavar='DIR',
+                             help='also capture the device image and save it as DIR/<udid>.png')
+    info_parser.set_defaults(handler=cmd_device_info)
+
+    backup_parser = commands.add_parser('backup', parents=[common, targets], help='back up devices')
+    backup_parser.add_argument('directory', help='folder the timestamped backup folders are created in')
+    backup_parser.add_argument('--incremental', action='store_true',
+                               help='seed from the latest previous backup of the same device')
+    backup_parser.add_argument('--dedup', action='store_true', help='move the backup into the deduplicated store')
+    backup_parser.add_argument('--hash', action='store_true', help='write a signed integrity manifest (SHA-256)')
+    backup_parser.add_argument('--legacy-hashes', action='store_true',
+                               help='integrity manifest with MD5 and SHA-1 as well as SHA-256')
+    backup_parser.set_defaults(handler=cmd_backup)
+    return parser
+
+
+def main(argv=None):
+    # Needed by the hashing process pool in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except KeyboardInterrupt:
+        return 130
+    except Exception as e:
+        # usbmuxd not running, unreadable backup folder, ...
+        print(f"[ERROR] {e or type(e).__name__}", file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
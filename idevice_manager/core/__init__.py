@@ -1,3 +1,8 @@
 """
 Core functionality for iDevice Manager
-"""
\ No newline at end of file
+
+Nothing in this package imports Qt. acquisition holds the device tasks
+(BackupTask, InfoTask) that the GUI and the command line run; discovery,
+device_info, capture, backup and the other modules are the pieces they
+are built from.
+"""
@@ -0,0 +1,507 @@
+"""
+Qt-free device tasks.
+
+BackupTask runs a full or incremental backup of one device on the calling
+thread; InfoTask fetches a device's properties and framed picture on a
+core.aio.DeviceIO loop. Both report through a TaskListener: status lines,
+overall progress, BackupProgress snapshots or device info, and a final
+one-line result, which also ends up in task.result. The GUI adapts them to
+Qt signals (main.TaskWorker, main.DeviceInfoTask), the command line front
+end (cli.py) prints them, and task_events() turns any task into an
+iterator of TaskEvent for pipelines that would rather pull.
+"""
+
+import inspect
+import io
+import math
+import os
+import queue
+import threading
+from collections import namedtuple
+from datetime import datetime
+
+from PIL import Image
+from pymobiledevice3.exceptions import InvalidServiceError, NoDeviceConnectedError
+from pymobiledevice3.usbmux import select_device
+
+from ..utils.fsstats import tree_stats
+from .backup import BackupEngine, ListenerGroup
+from .capture import encode_png
+from .connections import open_session
+from .device_info import INFO_DOMAINS, collect_device_info, fetch_device_values
+from .hashing import HashingPipeline, write_manifest
+from .incremental import (diff_manifests, find_previous_snapshot, mark_snapshot_complete, previous_manifest_db,
+                          seed_snapshot)
+from .progress import ProgressTracker
+from .store import ContentStore, default_store_root
+from .transcript import TRANSCRIPT_NAME, BackupTranscript
+
+
+class TaskListener:
+    """Receives status from a running task.
+
+    All methods are no-ops; override the ones you need. They are called on
+    the thread running the task.
+    """
+
+    def log(self, message):
+        """A status line; errors start with [ERROR], warnings with [WARNING]."""
+
+    def progress(self, percent):
+        """Overall task progress (0-100)."""
+
+    def backup_progress(self, progress):
+        """A core.progress.BackupProgress snapshot."""
+
+    def device_info(self, info):
+        """InfoTask results; may come twice, first from the cache with info['cached'] set."""
+
+    def finished(self, message):
+        """The one-line result of the task."""
+
+
+TaskEvent = namedtuple('TaskEvent', ['kind', 'value'])  # kind is a TaskListener method name
+
+
+class _QueueListener(TaskListener):
+    def __init__(self, events):
+        self.events = events
+
+    def log(self, message):
+        self.events.put(TaskEvent('log', message))
+
+    def progress(self, percent):
+        self.events.put(TaskEvent('progress', percent))
+
+    def backup_progress(self, progress):
+        self.events.put(TaskEvent('backup_progress', progress))
+
+    def device_info(self, info):
+        self.events.put(TaskEvent('device_info', info))
+
+    def finished(self, message):
+        self.events.put(TaskEvent('finished', message))
+
+
+def task_events(task):
+    """Run task on a background thread and yield its TaskEvents as they happen.
+
+    Replaces task.listener. An InfoTask runs on its device_io. The iterator
+    ends when the task has returned; task.result is complete by then.
+    """
+    events = queue.Queue()
+    task.listener = _QueueListener(events)
+    done = object()
+
+    def run():
+        try:
+            if inspect.iscoroutinefunction(task.run):
+                task.device_io.run(task.run())
+            else:
+                task.run()
+        finally:
+            events.put(done)
+
+    threading.Thread(target=run, name=f'{task.command}-task', daemon=True).start()
+    while True:
+        event = events.get()
+        if event is done:
+            return
+        yield event
+
+
+class _BackupEventListener(ProgressTracker):
+    """Forwards backup engine events to a TaskListener."""
+
+    def __init__(self, listener):
+        super().__init__(self._publish)
+        self.listener = listener
+
+    def _publish(self, progress):
+        # Scale device progress into the 30-90 range of the overall task
+        self.listener.progress(30 + int(progress.percent * 0.6))
+        self.listener.backup_progress(progress)
+
+    def on_file_error(self, file_name, message):
+        self.listener.log(f"[WARNING] Failed to back up {file_name}: {message}")
+
+    def on_log(self, message):
+        self.listener.log(f"BACKUP: {message}")
+
+
+class BackupTask:
+    """Full or incremental backup of one device into backup_directory.
+
+    result is filled in as the backup goes (udid, backup_path, counts,
+    manifest, ...) and always ends up with ok and message.
+    """
+    command = 'backup'
+
+    def __init__(self, backup_directory, udid=None, incremental=False, deduplicate=False, hash_algorithms=None,
+                 connection_pool=None, device_registry=None, listener=None):
+        self.backup_directory = backup_directory
+        self.udid = udid
+        self.incremental = incremental
+        self.deduplicate = deduplicate
+        self.hash_algorithms = hash_algorithms
+        self.connection_pool = connection_pool  # core.connections.ConnectionPool, optional
+        self.device_registry = device_registry  # core.discovery.DeviceRegistry, optional
+        self.listener = listener or TaskListener()
+        self.result = {}
+        self._session = None
+        self._device_values = {}  # lockdown domain -> values, read once per task
+
+    def _find_device(self):
+        """The requested (or first) device, from the live registry when there is one."""
+        device = None
+        if self.device_registry is not None and self.device_registry.live:
+            device = self.device_registry.select(self.udid)
+        return device or select_device(self.udid)
+
+    def _open_lockdown(self, device):
+        """Lockdown client for device, reusing a warm pooled session when possible."""
+        self._session = open_session(device, self.connection_pool)
+        return self._session.lockdown
+
+    def _release_lockdown(self):
+        if self._session is not None:
+            self._session.release()
+            self._session = None
+
+    def _get_device_values(self, lockdown, domains=INFO_DOMAINS):
+        """Lockdown values for the global domain (key None) and domains, fetched in bulk and cached."""
+        missing = [domain for domain in domains if domain not in self._device_values]
+        if None not in self._device_values or missing:
+            # Handshake values are only current on a session opened for this task
+            fresh = None not in self._device_values and getattr(self._session, 'fresh', False)
+            fetched = fetch_device_values(lockdown, missing, handshake_values=fresh)
+            if None in self._device_values:
+                del fetched[None]
+            self._device_values.update(fetched)
+        return self._device_values
+
+    def _finish(self, message, ok=False):
+        self.result.update(ok=ok, message=message)
+        self.listener.finished(message)
+
+    def run(self):
+        self.listener.log(f"Task '{self.command}' started...")
+        self.listener.progress(0)
+        
+        try:
+            if self.command == 'backup':
+                self.run_backup()
+        except Exception as e:
+            self.listener.log(f"[ERROR] An unexpected error occurred: {e}")
+            self._finish("Task failed with an unexpected error.")
+        finally:
+            self.listener.progress(0)
+
+    def run_backup(self):
+        """Performs a full or incremental device backup."""
+        hasher = transcript = None
+        failure = "interrupted"
+        try:
+            if not self.backup_directory:
+                self.listener.log("[ERROR] No backup directory specified.")
+                self._finish("Failed: No backup directory.")
+                return
+                
+            self.listener.log("Searching for connected devices...")
+            self.listener.progress(5)
+            
+            # Select the requested device, or the first available one
+            device = self._find_device()
+            if not device:
+                raise NoDeviceConnectedError("No USB devices found")
+                
+            self.listener.log(f"Found device: {device}")
+            self.listener.progress(10)
+            
+            # Create lockdown client
+            self.listener.log("Establishing lockdown connection...")
+            lockdown = self._open_lockdown(device)
+            self.listener.log("Device connected successfully")
+            self.listener.progress(20)
+            
+            # Get device name for backup folder
+            device_values = self._get_device_values(lockdown, domains=())[None]
+            device_name = device_values.get('DeviceName') or 'Unknown_Device'
+            device_name = "".join(c for c in device_name if c.isalnum() or c in (' ', '-', '_')).strip()
+            
+            # Create timestamped backup directory
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            backup_path = self._create_snapshot_dir(f"{device_name}_{timestamp}")
+            
+            self.listener.log(f"Creating backup in: {backup_path}")
+            self.result.update(udid=device_values.get('UniqueDeviceID'), device_name=device_name,
+                               backup_path=backup_path)
+            self.listener.progress(25)
+            
+            device_udid = device_values.get('UniqueDeviceID')
+            device_dir = os.path.join(backup_path, device_udid)
+            full_backup = True
+            previous_path = None
+            if self.incremental:
+                previous_path = find_previous_snapshot(self.backup_directory, device_udid, exclude=backup_path)
+                if previous_path:
+                    self.listener.log(f"Seeding incremental backup from: {previous_path}")
+                    counts = seed_snapshot(previous_path, backup_path, device_udid)
+                    self.listener.log(
+                        f"Reused {counts['link'] + counts['reflink']} unchanged files "
+                        f"({counts['copy']} copied)"
+                    )
+                    full_backup = False
+                else:
+                    self.listener.log("No previous backup of this device found, running a full backup")
+            
+            try:
+                self.listener.log("Starting in-process backup over the existing lockdown connection...")
+                self.listener.log("This may take several minutes depending on device content...")
+                self.listener.log("Note: Device must be unlocked and backup enabled in settings")
+                self.listener.progress(30)
+                
+                tracker = _BackupEventListener(self.listener)
+                transcript = BackupTranscript(os.path.join(backup_path, TRANSCRIPT_NAME))
+                hasher = HashingPipeline(backup_path, self.hash_algorithms) if self.hash_algorithms else None
+                engine = BackupEngine(lockdown, ListenerGroup(tracker, transcript, hasher))
+                try:
+                    engine.run(backup_path, full=full_backup)
+                except Exception as engine_error:
+                    transcript.close(f"failed: {engine_error}")
+                    # The recent events usually explain the failure; the rest is on disk
+                    self.listener.log("Last backup events:")
+                    for line in transcript.tail(10):
+                        self.listener.log(f"  {line}")
+                    self.listener.log(f"Full backup log: {transcript.path}")
+                    raise
+                tracker.finish()
+                transcript.write(f"transfer completed, {tracker.files_done} files")
+                self.result.update(files_transferred=tracker.files_done, bytes_transferred=tracker.bytes_done,
+                                   incremental=not full_backup, transcript=transcript.path)
+                self.listener.log(
+                    f"Transferred {tracker.files_done} files, {self._format_size(tracker.bytes_done)}"
+                )
+                previous_db = previous_path and previous_manifest_db(previous_path, device_udid)
+                if previous_db:
+                    diff = diff_manifests(previous_db, os.path.join(device_dir, 'Manifest.db'))
+                    if diff:
+                        self.listener.log(
+                            f"Changes since last backup: {diff.added} added, {diff.modified} modified, "
+                            f"{diff.removed} removed, {diff.unchanged} unchanged"
+                        )
+                
+                self.listener.progress(90)
+                self.listener.log("Backup completed successfully!")
+                self.listener.log(f"Backup saved to: {backup_path}")
+                
+                known_digests = {}
+                entries = None
+                if hasher:
+                    self.listener.progress(92)
+                    entries = hasher.finish(log=self.listener.log)
+                    manifest_path = write_manifest(backup_path, entries, self.hash_algorithms)
+                    self.listener.log(f"Signed integrity manifest written: {manifest_path}")
+                    self.result['manifest'] = manifest_path
+                    known_digests = {entry['path']: entry['sha256'] for entry in entries if 'sha256' in entry}
+                
+                # Get backup size, avoiding a second walk when it is already known
+                try:
+                    if entries is not None:
+                        backup_size, file_count = sum(entry['size'] for entry in entries), len(entries)
+                    elif full_backup:
+                        backup_size, file_count = tracker.bytes_done, tracker.files_done
+                    else:
+                        stats = tree_stats(device_dir)
+                        backup_size, file_count = stats.total_bytes, stats.file_count
+                    self.listener.log(f"Backup size: {self._format_size(backup_size)} in {file_count} files")
+                    self.result.update(size_bytes=backup_size, file_count=file_count)
+                except OSError:
+                    pass
+                
+                if self.deduplicate:
+                    self.listener.log("Moving backup into the deduplicated store...")
+                    store = ContentStore(default_store_root(backup_path))
+                    stats = store.ingest_snapshot(backup_path, known_digests)
+                    self.result['store'] = stats
+                    self.listener.log(
+                        f"Stored {stats['files']} files, {stats['new_objects']} new; "
+                        f"{self._format_size(stats['deduplicated_bytes'])} already in the store"
+                    )
+                
+                # Only now may later incremental backups seed from this snapshot
+                mark_snapshot_complete(backup_path, device_udid)
+                transcript.close(f"completed, {tracker.files_done} files")
+                self.listener.progress(100)
+                self._finish(f"Backup completed successfully in {backup_path}", ok=True)
+                
+            except InvalidServiceError:
+                failure = "backup service not available"
+                self.listener.log("[ERROR] Backup service not available on this device.")
+                self.listener.log("Device may need to be unlocked or backup service disabled.")
+                self._finish("Failed: Backup service not available.")
+            except Exception as backup_error:
+                failure = str(backup_error) or type(backup_error).__name__
+                self.listener.log(f"[ERROR] Backup process failed: {backup_error}")
+                self._finish("Backup failed during process.")
+                
+        except NoDeviceConnectedError:
+            self.listener.log("[ERROR] No device connected. Please connect a device and try again.")
+            self._finish("Failed: No device connected.")
+        except Exception as e:
+            failure = str(e) or type(e).__name__
+            self.listener.log(f"[ERROR] Backup failed: {e}")
+            self._finish("Backup failed.")
+        finally:
+            if hasher:
+                hasher.close()  # no-op after finish(); stops the workers on every failure path
+            if transcript:
+                # No-op unless the backup failed after the transcript was opened
+                transcript.close(f"failed: {failure}")
+            self._release_lockdown()
+    
+    def _create_snapshot_dir(self, name):
+        """Create a new snapshot folder under backup_directory and return its path.
+
+        Devices with the same name starting in the same second (parallel
+        backups) get '<name>_2', '<name>_3', ... rather than sharing a folder.
+        """
+        os.makedirs(self.backup_directory, exist_ok=True)
+        path = os.path.join(self.backup_directory, name)
+        suffix = 1
+        while True:
+            try:
+                os.mkdir(path)
+                return path
+            except FileExistsError:
+                suffix += 1
+                path = os.path.join(self.backup_directory, f"{name}_{suffix}")
+    
+    def _format_size(self, size_bytes):
+        """Format bytes as human readable size."""
+        if size_bytes == 0:
+            return "0 B"
+        size_names = ["B", "KB", "MB", "GB", "TB"]
+        i = int(math.floor(math.log(size_bytes, 1024)))
+        p = math.pow(1024, i)
+        s = round(size_bytes / p, 2)
+        return f"{s} {size_names[i]}"
+
+
+def _decode_png(png_data):
+    with Image.open(io.BytesIO(png_data)) as img:
+        return img.convert('RGBA')
+
+
+class InfoTask:
+    """Properties and framed picture of one device, run on a core.aio.DeviceIO.
+
+    listener.device_info() gets the info dict with the picture under
+    'screenshot_image': a display-sized RGBA PIL image, or whatever
+    image_factory (called in the executor) makes of it, or None. With an
+    info_cache the cached info is delivered first (with cached=True) and
+    the result is stored afterwards. result holds the final info (without
+    the picture) under 'info', plus the winning capture source.
+    """
+    command = 'device-info'
+
+    def __init__(self, device_io, udid=None, info_cache=None, connection_pool=None, device_registry=None,
+                 capture_memory=None, capture=True, image_factory=None, listener=None):
+        self.device_io = device_io
+        self.udid = udid
+        self.info_cache = info_cache  # core.info_cache.DeviceInfoCache, optional
+        self.connection_pool = connection_pool  # core.connections.ConnectionPool, optional
+        self.device_registry = device_registry  # core.discovery.DeviceRegistry, optional
+        self.capture_memory = capture_memory  # core.capture.CaptureMemory, optional
+        self.capture = capture
+        self.image_factory = image_factory
+        self.listener = listener or TaskListener()
+        self.result = {}
+
+    def _finish(self, message, ok=False):
+        self.result.update(ok=ok, message=message)
+        self.listener.finished(message)
+
+    async def _image(self, image):
+        if image is None or self.image_factory is None:
+            return image
+        return await self.device_io.call(self.image_factory, image)
+
+    async def run(self):
+        """Fetches device properties and a screenshot."""
+        device_io = self.device_io
+        listener = self.listener
+        log = listener.log
+        session = None
+        log(f"Task '{self.command}' started...")
+        try:
+            log("Searching for connected devices...")
+            listener.progress(10)
+            
+            # Select the requested device, or the first available one
+            device = None
+            if self.device_registry is not None and self.device_registry.live:
+                device = self.device_registry.select(self.udid)
+            device = device or await device_io.call(select_device, self.udid)
+            if not device:
+                raise NoDeviceConnectedError("No USB devices found")
+                
+            log(f"Found device: {device}")
+            self.result['udid'] = device.serial
+            listener.progress(25)
+            
+            # Show what we know about this device while the refresh runs
+            connection_id = getattr(device, 'devid', None)
+            cached_info, stale_fields, cached_image = None, None, None
+            if self.info_cache is not None:
+                if await device_io.call(self.info_cache.note_connection, device.serial, connection_id):
+                    log("Device was reconnected, discarding cached volatile info")
+                cached_info, stale_fields = await device_io.call(self.info_cache.get, device.serial)
+                if cached_info:
+                    log("Showing cached device info while refreshing...")
+                    if cached_info.get('screenshot'):
+                        cached_image = await self._image(await device_io.call(_decode_png, cached_info['screenshot']))
+                    listener.device_info(dict(cached_info, cached=True, screenshot_image=cached_image))
+            reuse_screenshot = bool(self.capture and cached_info and cached_info.get('screenshot')
+                                    and 'screenshot' not in stale_fields)
+            
+            log("Establishing lockdown connection...")
+            session = await device_io.call(open_session, device, self.connection_pool)
+            log("Device connected successfully")
+            listener.progress(50)
+            
+            log("Retrieving device information...")
+            device_info, source = await collect_device_info(device_io, session, log, listener.progress,
+                                                            capture=self.capture and not reuse_screenshot,
+                                                            capture_memory=self.capture_memory)
+            framed = device_info.pop('screenshot_image', None)
+            if reuse_screenshot:
+                # The cached framed screenshot is still fresh
+                image = cached_image
+                log("Using cached screenshot")
+            else:
+                image = await self._image(framed)
+            
+            listener.progress(100)
+            self.result.update(info=dict(device_info), capture_source=source)
+            listener.device_info(dict(device_info, screenshot_image=image))
+            if self.info_cache is not None:
+                # The mockup is not worth caching; try a real capture next time
+                if framed is not None and source != 'placeholder':
+                    device_info['screenshot'] = await device_io.call(encode_png, framed)
+                await device_io.call(self.info_cache.put, device.serial, device_info, connection_id)
+            self._finish("Device info retrieved successfully.", ok=True)
+            
+        except NoDeviceConnectedError:
+            log("[ERROR] No device connected. Please connect a device and try again.")
+            self._finish("Failed: No device connected.")
+        except InvalidServiceError as e:
+            log(f"[ERROR] Service not available on device: {e}")
+            self._finish("Failed: Service not supported by device.")
+        except Exception as e:
+            log(f"[ERROR] Could not get device info: {e}")
+            self._finish("Failed to retrieve device info.")
+        finally:
+            if session is not None:
+                await device_io.call(session.release)
+            listener.progress(0)
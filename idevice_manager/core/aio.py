@@ -0,0 +1,95 @@
+"""
+Asyncio device I/O.
+
+pymobiledevice3's device API (before 8.x) is blocking. DeviceIO runs one
+asyncio event loop on a background thread and pushes each blocking device
+call through a shared thread pool, so a waiting task costs a coroutine,
+not a thread. Many devices, and independent queries on one device, are
+multiplexed on that loop.
+
+Requests over a device's lockdown connection (value queries, starting a
+service) must not interleave, so they go through lockdown_call(), which
+serializes them per UDID. Service connections (SpringBoard, screenshotr)
+have their own sockets and run concurrently.
+
+Callers on other threads use submit(); Qt code connects to the returned
+future's result through a signal (see main.DeviceInfoTask).
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_MAX_WORKERS = 32
+
+
+class DeviceIO:
+    """Background event loop plus executor for blocking device calls."""
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS):
+        self.max_workers = max_workers
+        self.loop = None
+        self._executor = None
+        self._thread = None
+        self._locks = {}  # udid -> asyncio.Lock, only touched on the loop thread
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='device-io')
+            self.loop = asyncio.new_event_loop()
+            self.loop.set_default_executor(self._executor)
+            ready = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(ready,), name='device-io-loop', daemon=True)
+            self._thread.start()
+            ready.wait()
+
+    def _run(self, ready):
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(ready.set)
+        self.loop.run_forever()
+
+    def stop(self):
+        """Stop the loop. Pending blocking calls are left to finish in the pool."""
+        with self._start_lock:
+            if self._thread is None:
+                return
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=5)
+            self._executor.shutdown(wait=False)
+            self.loop.close()
+            self._thread = self.loop = self._executor = None
+            self._locks.clear()
+
+    def submit(self, coro):
+        """Schedule a coroutine from any thread. Returns a concurrent.futures.Future."""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the loop and wait for its result (not from the loop thread)."""
+        return self.submit(coro).result(timeout)
+
+    async def call(self, fn, *args, **kwargs):
+        """Run a blocking function in the executor."""
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(fn, *args, **kwargs))
+
+    async def lockdown_call(self, udid, fn, *args, **kwargs):
+        """Run a blocking call that talks over udid's lockdown connection, one at a time."""
+        lock = self._locks.get(udid)
+        if lock is None:
+            lock = self._locks[udid] = asyncio.Lock()
+        async with lock:
+            future = asyncio.ensure_future(self.call(fn, *args, **kwargs))
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The blocking call cannot be interrupted; keep the connection
+                # locked until it has returned
+                await asyncio.wait([future])
+                if not future.cancelled():
+                    future.exception()  # nobody is waiting for the outcome any more
+                raise
@@ -0,0 +1,178 @@
+"""
+In-process backup engine built on the mobilebackup2 device link.
+
+Reuses an existing lockdown connection and streams uploaded file data
+straight to disk, reporting through a BackupListener instead of scraping
+console output.
+"""
+
+import struct
+from contextlib import contextmanager
+from pathlib import Path
+
+from pymobiledevice3.services.device_link import DeviceLink
+from pymobiledevice3.services.mobilebackup2 import Mobilebackup2Service
+
+# Device link file transfer framing: a 4 byte big-endian size followed by
+# a one byte code. The size includes the code byte.
+HEADER_FORMAT = '>IB'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+CODE_SIZE = 1
+CODE_SUCCESS = 0x00
+CODE_ERROR_REMOTE = 0x0b
+CODE_FILE_DATA = 0x0c
+
+# Largest block read from the socket at once while streaming a file
+CHUNK_SIZE = 1024 * 1024
+
+
+class BackupError(Exception):
+    """Raised when the device link protocol cannot be completed."""
+
+
+class BackupListener:
+    """Receives structured events from a running backup.
+
+    All methods are no-ops; override the ones you need. They are called on
+    the thread running the backup.
+    """
+
+    def on_progress(self, percent):
+        """Overall progress as reported by the device (0-100)."""
+
+    def on_file_started(self, device_name, file_name):
+        """The device started sending a file."""
+
+    def on_file_chunk(self, file_name, nbytes):
+        """A block of file data was written to disk."""
+
+    def on_file_finished(self, file_name, nbytes):
+        """A file was received completely."""
+
+    def on_file_error(self, file_name, message):
+        """The device could not send a file."""
+
+    def on_log(self, message):
+        """Free form status message."""
+
+
+class ListenerGroup(BackupListener):
+    """Forwards every event to several listeners in order."""
+
+    def __init__(self, *listeners):
+        self.listeners = [listener for listener in listeners if listener is not None]
+
+    def on_progress(self, percent):
+        for listener in self.listeners:
+            listener.on_progress(percent)
+
+    def on_file_started(self, device_name, file_name):
+        for listener in self.listeners:
+            listener.on_file_started(device_name, file_name)
+
+    def on_file_chunk(self, file_name, nbytes):
+        for listener in self.listeners:
+            listener.on_file_chunk(file_name, nbytes)
+
+    def on_file_finished(self, file_name, nbytes):
+        for listener in self.listeners:
+            listener.on_file_finished(file_name, nbytes)
+
+    def on_file_error(self, file_name, message):
+        for listener in self.listeners:
+            listener.on_file_error(file_name, message)
+
+    def on_log(self, message):
+        for listener in self.listeners:
+            listener.on_log(message)
+
+
+class StreamingDeviceLink(DeviceLink):
+    """Device link that writes uploaded files in bounded chunks."""
+
+    def __init__(self, service, root_path, listener):
+        super().__init__(service, Path(root_path))
+        self.listener = listener
+
+    def upload_files(self, message):
+        while True:
+            device_name = self._prefixed_recv()
+            if not device_name:
+                break
+            file_name = self._prefixed_recv()
+            self.listener.on_file_started(device_name, file_name)
+
+            file_path = self.root_path / file_name
+            # Never write through a hard link shared with an older snapshot
+            if file_path.exists():
+                file_path.unlink()
+            written = 0
+            size, code = self._recv_header()
+            with open(file_path, 'wb') as fd:
+                while size and code == CODE_FILE_DATA:
+                    written += self._stream_block(fd, file_name, size)
+                    size, code = self._recv_header()
+
+            if code == CODE_ERROR_REMOTE:
+                error_message = self.service.recvall(size).decode(errors='replace')
+                self.listener.on_file_error(file_name, error_message)
+                continue
+            if code != CODE_SUCCESS:
+                raise BackupError(f"Unexpected transfer code {code:#x} for {file_name}")
+            self.listener.on_file_finished(file_name, written)
+
+        self.status_response(0)
+
+    def _recv_header(self):
+        """Read a transfer header, returning (payload size, code)."""
+        size, code = struct.unpack(HEADER_FORMAT, self.service.recvall(HEADER_SIZE))
+        return size - CODE_SIZE, code
+
+    def _stream_block(self, fd, file_name, size):
+        """Copy one data block from the socket to fd without buffering it whole."""
+        remaining = size
+        while remaining:
+            chunk = self.service.recvall(min(remaining, CHUNK_SIZE))
+            fd.write(chunk)
+            remaining -= len(chunk)
+            self.listener.on_file_chunk(file_name, len(chunk))
+        return size
+
+
+class StreamingBackupService(Mobilebackup2Service):
+    """Mobilebackup2Service using StreamingDeviceLink for file transfers."""
+
+    def __init__(self, lockdown, listener):
+        super().__init__(lockdown)
+        self.listener = listener
+
+    @contextmanager
+    def device_link(self, backup_directory):
+        dl = StreamingDeviceLink(self.service, backup_directory, self.listener)
+        dl.version_exchange()
+        self.version_exchange(dl)
+        try:
+            yield dl
+        finally:
+            dl.disconnect()
+
+
+class BackupEngine:
+    """Runs a mobilebackup2 backup over an existing lockdown connection."""
+
+    def __init__(self, lockdown, listener=None):
+        self.lockdown = lockdown
+        self.listener = listener or BackupListener()
+
+    def run(self, backup_path, full=True):
+        """Back up the device into backup_path/<UDID>."""
+        self.listener.on_log("Starting mobilebackup2 service...")
+        service = StreamingBackupService(self.lockdown, self.listener)
+        try:
+            service.backup(
+                full=full,
+                backup_directory=backup_path,
+                progress_callback=self.listener.on_progress,
+            )
+        finally:
+            service.close()
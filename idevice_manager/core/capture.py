@@ -0,0 +1,418 @@
+"""
+Visual representation of a device for the info panel.
+
+The sources are the home screen wallpaper, a wallpaper preview and an app
+icon through SpringBoard, and a real screenshot through screenshotr. They
+are raced: each runs on its own service connection with its own deadline
+and the first usable image wins. CaptureMemory remembers the winner per
+ProductType and iOS version, and that method gets a head start next time.
+A drawn placeholder is used when every source fails. Captures are scaled
+to display size and put in an iPhone-like frame; the frame artwork is
+rendered once per screen size.
+"""
+
+import asyncio
+import functools
+import io
+import json
+import os
+import threading
+
+from PIL import Image, ImageDraw, ImageFont
+from pymobiledevice3.services.screenshot import ScreenshotService
+from pymobiledevice3.services.springboard import SpringBoardServicesService
+
+from ..utils.paths import app_data_dir
+
+COMMON_APPS = [
+    'com.apple.Preferences',  # Settings
+    'com.apple.camera',       # Camera
+    'com.apple.mobilephone',  # Phone
+    'com.apple.mobilesafari', # Safari
+    'com.apple.MobileSMS'     # Messages
+]
+WALLPAPER_NAMES = ['Default', 'OriginalPhoto', 'UserPhoto']
+
+# Source -> seconds it may take, service start included
+SOURCE_DEADLINES = {
+    'wallpaper': 6.0,
+    'wallpaper_preview': 6.0,
+    'app_icon': 8.0,
+    'screenshot': 10.0,
+}
+# Seconds a remembered method runs alone before the other sources join
+PREFERRED_HEAD_START = 1.5
+MEMORY_FILENAME = 'capture-methods.json'
+
+
+def _noop(message):
+    pass
+
+
+def is_ssl_error(error):
+    return "SSL" in str(error) or "BAD_LENGTH" in str(error)
+
+
+def is_image(data):
+    """True if data is a complete image Pillow can read."""
+    if not data:
+        return False
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img.verify()
+        return True
+    except Exception:
+        return False
+
+
+def _wallpaper(springboard, log):
+    return springboard.get_wallpaper_pngdata()
+
+
+def _wallpaper_preview(springboard, log):
+    for name in WALLPAPER_NAMES:
+        try:
+            data = springboard.get_wallpaper_preview_image(name)
+        except Exception:
+            continue
+        if data:
+            log(f"Got wallpaper preview: {name}")
+            return data
+    return None
+
+
+def _app_icon(springboard, log):
+    """Icon of a well-known app, or of the first app on the home screen."""
+    icon_state = springboard.get_icon_state()
+    if not icon_state:
+        return None
+    for app_bundle in COMMON_APPS:
+        try:
+            icon_data = springboard.get_icon_pngdata(app_bundle)
+            if icon_data:
+                log(f"Got app icon for display: {app_bundle}")
+                return icon_data
+        except Exception:
+            continue
+
+    for page in icon_state:
+        if not isinstance(page, list):
+            continue
+        for item in page:
+            if isinstance(item, dict) and 'bundleIdentifier' in item:
+                bundle_id = item['bundleIdentifier']
+                try:
+                    icon_data = springboard.get_icon_pngdata(bundle_id)
+                    if icon_data:
+                        log(f"Got icon from first app: {bundle_id}")
+                        return icon_data
+                except Exception:
+                    continue
+    return None
+
+
+def _screenshot(screenshotr, log):
+    return screenshotr.take_screenshot()
+
+
+# Source -> (service class, function(service, log) returning image data).
+# Without a remembered winner, ties go to the earlier entry.
+CAPTURE_SOURCES = {
+    'wallpaper': (SpringBoardServicesService, _wallpaper),
+    'wallpaper_preview': (SpringBoardServicesService, _wallpaper_preview),
+    'app_icon': (SpringBoardServicesService, _app_icon),
+    'screenshot': (ScreenshotService, _screenshot),
+}
+
+
+def capture_key(device_values):
+    """Key CaptureMemory uses for a device: ProductType/ProductVersion, or None."""
+    product_type = device_values.get('ProductType')
+    product_version = device_values.get('ProductVersion')
+    if not product_type or not product_version:
+        return None
+    return f"{product_type}/{product_version}"
+
+
+class CaptureMemory:
+    """Winning capture source per capture_key(), persisted as JSON. Thread-safe."""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(app_data_dir(), MEMORY_FILENAME)
+        self._methods = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._methods is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as fd:
+                    methods = json.load(fd)
+                self._methods = {key: source for key, source in methods.items() if source in CAPTURE_SOURCES}
+            except (OSError, ValueError, AttributeError):
+                self._methods = {}
+        return self._methods
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + '.tmp', 'w', encoding='utf-8') as fd:
+            json.dump(self._methods, fd, indent=1, sort_keys=True)
+        os.replace(self.path + '.tmp', self.path)
+
+    def get(self, key):
+        with self._lock:
+            return self._load().get(key)
+
+    def remember(self, key, source):
+        with self._lock:
+            if self._load().get(key) != source:
+                self._methods[key] = source
+                self._save()
+
+    def forget(self, key):
+        with self._lock:
+            if self._load().pop(key, None) is not None:
+                self._save()
+
+
+async def capture_visual(io, session, key=None, memory=None, log=_noop):
+    """Race the capture sources on a core.aio.DeviceIO.
+
+    session is a core.connections session; each source gets its own service
+    connection on it. The winner's connection is kept for reuse, those of
+    failed or cancelled sources are closed (which also unblocks a call
+    stuck past its deadline). Returns (image_data, source), or (None, None)
+    when nothing could be captured.
+    """
+    remembered = memory is not None and key is not None
+    preferred = await io.call(memory.get, key) if remembered else None
+    order = sorted(CAPTURE_SOURCES, key=lambda source: source != preferred)
+
+    async def attempt(source):
+        service_class, grab = CAPTURE_SOURCES[source]
+        name = 'capture:' + source
+        abandoned = False
+
+        def open_service():
+            service = session.service(name, service_class)
+            if abandoned:
+                # The source lost or failed while the (uninterruptible) service start was running
+                session.discard_service(name)
+            return service
+
+        async def run():
+            service = await io.lockdown_call(session.udid, open_service)
+            return await io.call(grab, service, log)
+
+        try:
+            try:
+                data = await asyncio.wait_for(run(), SOURCE_DEADLINES[source])
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"no answer within {SOURCE_DEADLINES[source]:g}s")
+            if not is_image(data):
+                raise ValueError("no usable image returned")
+        except BaseException:
+            abandoned = True
+            session.discard_service(name)
+            raise
+        return data
+
+    tasks = {}  # task -> source
+    waiting = list(order)
+
+    def launch(count):
+        for source in waiting[:count]:
+            task = asyncio.ensure_future(attempt(source))
+            # Losers may fail after the race is decided; nobody reads those errors
+            task.add_done_callback(lambda task: task.cancelled() or task.exception())
+            tasks[task] = source
+        del waiting[:count]
+
+    # A remembered winner runs alone for a moment; otherwise everything starts at once
+    launch(1 if preferred else len(waiting))
+    pending = set(tasks)
+    ssl_failure = False
+    try:
+        while pending:
+            timeout = PREFERRED_HEAD_START if waiting else None
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=lambda task: order.index(tasks[task])):
+                source = tasks[task]
+                try:
+                    data = task.result()
+                except Exception as e:
+                    ssl_failure = ssl_failure or is_ssl_error(e)
+                    log(f"[WARNING] Capture via {source} failed: {e or type(e).__name__}")
+                    continue
+                log(f"Captured device image via {source}")
+                if remembered:
+                    await io.call(memory.remember, key, source)
+                return data, source
+            if waiting:
+                launch(len(waiting))
+                pending |= {task for task, source in tasks.items() if not task.done()}
+    finally:
+        for task in pending:
+            task.cancel()
+
+    if ssl_failure:
+        log("💡 Tip: SSL errors often indicate device trust issues")
+        log("💡 Try: 1) Check 'Trust This Computer' on device 2) Re-pair device 3) Update iOS")
+    if remembered:
+        await io.call(memory.forget, key)
+    return None, None
+
+
+# Largest framed image worth producing: the info panel shows it in a
+# 200x400 label, doubled for HiDPI screens
+FRAMED_MAX_SIZE = (400, 800)
+FRAME_THICKNESS = 20
+# Extra height above (notch) and below (home indicator) the screen
+FRAME_TOP = 30
+FRAME_BOTTOM = 30
+FRAME_COLOR = '#2c2c2c'
+
+
+@functools.lru_cache(maxsize=16)
+def _frame_template(screen_width, screen_height):
+    """Pre-rendered frame (body, notch, home indicator) around a screen of the given size."""
+    frame_width = screen_width + FRAME_THICKNESS * 2
+    frame_height = screen_height + FRAME_THICKNESS * 2 + FRAME_TOP + FRAME_BOTTOM
+    template = Image.new('RGBA', (frame_width, frame_height), color=(0, 0, 0, 0))
+    draw = ImageDraw.Draw(template)
+
+    # iPhone frame
+    draw.rounded_rectangle(
+        [0, 0, frame_width, frame_height],
+        radius=25,
+        fill=FRAME_COLOR,
+        outline='#404040',
+        width=2
+    )
+
+    # iPhone notch
+    notch_width = 60
+    notch_x = (frame_width - notch_width) // 2
+    notch_y = FRAME_THICKNESS + 5
+    draw.rounded_rectangle([notch_x, notch_y, notch_x + notch_width, notch_y + 8], radius=4, fill='#1a1a1a')
+
+    # Home indicator
+    indicator_width = 40
+    indicator_x = (frame_width - indicator_width) // 2
+    indicator_y = frame_height - FRAME_THICKNESS - 8
+    draw.rounded_rectangle([indicator_x, indicator_y, indicator_x + indicator_width, indicator_y + 3],
+                           radius=2, fill='#666666')
+    return template
+
+
+def encode_png(img):
+    """PNG bytes of a framed image (for the info cache; the GUI takes the image itself)."""
+    # Small images; favour encode speed over a few bytes of compression
+    img_buffer = io.BytesIO()
+    img.save(img_buffer, format='PNG', compress_level=1)
+    return img_buffer.getvalue()
+
+
+def frame_image(screenshot_data):
+    """Display-sized RGBA image of a screenshot (PNG data) in an iPhone-like frame.
+
+    The screenshot is scaled down to fit FRAMED_MAX_SIZE first, so a
+    full-resolution capture costs a decode and a resize, not a full-size
+    composite.
+    """
+    screen = Image.open(io.BytesIO(screenshot_data))
+    max_width, max_height = FRAMED_MAX_SIZE
+    screen.thumbnail((max_width - FRAME_THICKNESS * 2,
+                      max_height - FRAME_THICKNESS * 2 - FRAME_TOP - FRAME_BOTTOM),
+                     Image.Resampling.BILINEAR, reducing_gap=1.0)
+    screen = screen.convert('RGBA')
+
+    framed_img = _frame_template(screen.width, screen.height).copy()
+    framed_img.alpha_composite(screen, (FRAME_THICKNESS, FRAME_THICKNESS + FRAME_TOP))
+    return framed_img
+
+
+def frame_screenshot(screenshot_data):
+    """Create an iPhone-like frame around a screenshot (PNG in, PNG out)."""
+    try:
+        return encode_png(frame_image(screenshot_data))
+    except Exception:
+        # If framing fails, return original screenshot
+        return screenshot_data
+
+
+@functools.lru_cache(maxsize=1)
+def _fonts():
+    try:
+        return (ImageFont.truetype("arial.ttf", 24), ImageFont.truetype("arial.ttf", 16),
+                ImageFont.truetype("arial.ttf", 12))
+    except OSError:
+        default = ImageFont.load_default()
+        return default, default, default
+
+
+# Placeholder geometry: a 200x420 screen in the standard frame (240x520)
+PLACEHOLDER_SCREEN = (200, 420)
+
+
+@functools.lru_cache(maxsize=1)
+def _placeholder_template():
+    """The device-independent part of the placeholder: frame, blank screen, messages and icons."""
+    screen_width, screen_height = PLACEHOLDER_SCREEN
+    img = _frame_template(screen_width, screen_height).copy()
+    draw = ImageDraw.Draw(img)
+    font_large, font_med, font_small = _fonts()
+
+    # Screen area
+    screen_x = FRAME_THICKNESS
+    screen_y = FRAME_THICKNESS + FRAME_TOP
+    draw.rounded_rectangle(
+        [screen_x, screen_y, screen_x + screen_width, screen_y + screen_height],
+        radius=15,
+        fill='#000000'
+    )
+
+    screen_center_x = screen_x + screen_width // 2
+    screen_center_y = screen_y + screen_height // 2
+    draw.text((screen_center_x, screen_center_y - 60), "📱", fill='white', anchor='mm', font=font_large)
+
+    # Bottom message
+    draw.text((screen_center_x, screen_center_y + 80), "Screenshot unavailable", fill='#666', anchor='mm', font=font_small)
+    draw.text((screen_center_x, screen_center_y + 100), "SSL connection issue", fill='#666', anchor='mm', font=font_small)
+
+    # Add some iOS-style app icons at the bottom
+    icon_y = screen_y + screen_height - 60
+    icons = ['⚙️', '📷', '📱', '🌐']
+    for i, icon in enumerate(icons):
+        icon_x = screen_x + 30 + i * 35
+        # Icon background
+        draw.rounded_rectangle(
+            [icon_x - 14, icon_y - 14, icon_x + 14, icon_y + 14],
+            radius=7,
+            fill='#333333'
+        )
+        draw.text((icon_x, icon_y), icon, fill='white', anchor='mm', font=font_med)
+    return img
+
+
+def placeholder_frame(device_info):
+    """RGBA image of a drawn iPhone showing the device name, for when nothing can be captured."""
+    img = _placeholder_template().copy()
+    draw = ImageDraw.Draw(img)
+    _, font_med, font_small = _fonts()
+
+    # Add device info text on screen
+    device_name = device_info.get('DeviceName', 'iOS Device')
+    ios_version = device_info.get('ProductVersion', 'Unknown')
+    model = device_info.get('ProductType', 'Unknown')
+
+    screen_center_x = FRAME_THICKNESS + PLACEHOLDER_SCREEN[0] // 2
+    screen_center_y = FRAME_THICKNESS + FRAME_TOP + PLACEHOLDER_SCREEN[1] // 2
+    draw.text((screen_center_x, screen_center_y - 20), device_name, fill='white', anchor='mm', font=font_med)
+    draw.text((screen_center_x, screen_center_y + 10), f"iOS {ios_version}", fill='#a0a0a0', anchor='mm', font=font_small)
+    draw.text((screen_center_x, screen_center_y + 30), model.replace('iPhone', ''), fill='#a0a0a0', anchor='mm', font=font_small)
+    return img
+
+
+def placeholder_image(device_info):
+    """PNG version of placeholder_frame()."""
+    return encode_png(placeholder_frame(device_info))
@@ -0,0 +1,219 @@
+"""
+Shared lockdown sessions.
+
+Creating a lockdown client means a usbmux connect, a pairing record lookup
+and a TLS handshake. ConnectionPool keeps one warm session per UDID,
+together with the service connections opened on it (SpringBoard,
+screenshotr), so back-to-back tasks on the same device skip that setup.
+
+Sessions are health-checked with a cheap GetValue before reuse (the client
+transparently re-handshakes if lockdownd dropped a silent connection), are
+rebuilt when the device re-attaches, and are closed after idle_timeout
+seconds without use. mobilebackup2 is not pooled: the device ends the
+device-link session at the end of every backup.
+"""
+
+import threading
+import time
+
+from pymobiledevice3.lockdown import create_using_usbmux
+
+DEFAULT_IDLE_TIMEOUT = 120
+# Sessions used more recently than this are not re-checked before reuse
+HEALTH_CHECK_AFTER = 5
+
+
+def _close_quietly(connection):
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+class DirectSession:
+    """A lockdown client and the service connections opened on it.
+
+    Used as-is for connections outside the pool; release() closes it.
+    """
+
+    def __init__(self, udid, lockdown):
+        self.udid = udid
+        self.lockdown = lockdown
+        self.services = {}  # name -> service object
+        # True until the session is reused: only then is lockdown.all_values
+        # (read at the handshake) current
+        self.fresh = True
+
+    def service(self, name, factory):
+        """Return the cached service called name, creating it with factory(lockdown)."""
+        if name not in self.services:
+            self.services[name] = factory(self.lockdown)
+        return self.services[name]
+
+    def discard_service(self, name):
+        """Close and forget a service connection that failed."""
+        service = self.services.pop(name, None)
+        if service is not None:
+            _close_quietly(service)
+
+    def close(self):
+        for name in list(self.services):
+            self.discard_service(name)
+        _close_quietly(self.lockdown)
+
+    def release(self, failed=False):
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release(failed=exc_type is not None)
+
+
+class PooledSession(DirectSession):
+    """A session owned by a ConnectionPool; release() hands it back."""
+
+    def __init__(self, pool, udid, connection_id, lockdown, pooled=True):
+        super().__init__(udid, lockdown)
+        self.pool = pool
+        self.connection_id = connection_id
+        self.pooled = pooled
+        self.last_used = pool.clock()
+        self.in_use = False
+
+    def release(self, failed=False):
+        self.pool.release(self, failed)
+
+
+def open_session(device, connection_pool=None):
+    """Session for a usbmux device: pooled when there is a pool, a private DirectSession otherwise (blocking)."""
+    if connection_pool is not None:
+        return connection_pool.acquire(device.serial, getattr(device, 'devid', None))
+    return DirectSession(device.serial, create_using_usbmux(device.serial))
+
+
+class ConnectionPool:
+    """Warm lockdown sessions keyed by UDID. Thread-safe.
+
+    A session is used by one task at a time; if a task asks for a device
+    whose session is busy (e.g. during a backup) it gets a private session
+    that is closed on release.
+    """
+
+    def __init__(self, idle_timeout=DEFAULT_IDLE_TIMEOUT, connect=None, clock=time.monotonic):
+        self.idle_timeout = idle_timeout
+        self.connect = connect or create_using_usbmux
+        self.clock = clock
+        self._sessions = {}  # udid -> PooledSession
+        self._lock = threading.Lock()
+        self._reaper = None
+        self._stopped = threading.Event()
+
+    def acquire(self, udid, connection_id=None):
+        """Return a PooledSession for udid. Call release() (or use it as a context manager)."""
+        with self._lock:
+            session = self._sessions.get(udid)
+            if session is not None and session.in_use:
+                session = None
+                pooled = False
+            else:
+                pooled = True
+                if session is not None and connection_id is not None and session.connection_id != connection_id:
+                    # The device was re-attached; the old transport is gone
+                    del self._sessions[udid]
+                    session.close()
+                    session = None
+                if session is not None:
+                    session.in_use = True
+                    session.fresh = False
+
+        if session is not None and self.clock() - session.last_used > HEALTH_CHECK_AFTER:
+            try:
+                session.lockdown.get_value(key='UniqueDeviceID')
+            except Exception:
+                with self._lock:
+                    self._sessions.pop(udid, None)
+                session.close()
+                session = None
+
+        if session is None:
+            session = PooledSession(self, udid, connection_id, self.connect(serial=udid), pooled)
+            session.in_use = True
+            if pooled:
+                with self._lock:
+                    self._sessions[udid] = session
+                self._ensure_reaper()
+        return session
+
+    def release(self, session, failed=False):
+        """Return a session to the pool. Failed sessions are closed."""
+        with self._lock:
+            session.in_use = False
+            session.last_used = self.clock()
+            if failed and self._sessions.get(session.udid) is session:
+                del self._sessions[session.udid]
+        if failed or not session.pooled:
+            session.close()
+
+    def prewarm(self, udid, connection_id=None, attempts=3, delay=1.0):
+        """Open a session for a newly attached device in the background.
+
+        lockdownd may not accept connections for a moment after attach, so a
+        few attempts are made; failures (e.g. an untrusted device) are ignored.
+        """
+        def warm():
+            for attempt in range(attempts):
+                if attempt and self._stopped.wait(delay):
+                    return
+                try:
+                    self.acquire(udid, connection_id).release()
+                    return
+                except Exception:
+                    continue
+
+        threading.Thread(target=warm, name=f'prewarm-{udid[:8]}', daemon=True).start()
+
+    def invalidate(self, udid, connection_id=None):
+        """Close the idle session for udid, e.g. when the device is detached.
+
+        With connection_id, only a session on that usbmux connection is closed.
+        """
+        with self._lock:
+            session = self._sessions.get(udid)
+            if session is None or session.in_use:
+                return
+            if connection_id is not None and session.connection_id not in (None, connection_id):
+                return
+            del self._sessions[udid]
+        session.close()
+
+    def close_idle(self):
+        """Close sessions unused for longer than idle_timeout."""
+        now = self.clock()
+        with self._lock:
+            expired = [s for s in self._sessions.values()
+                       if not s.in_use and now - s.last_used > self.idle_timeout]
+            for session in expired:
+                del self._sessions[session.udid]
+        for session in expired:
+            session.close()
+
+    def close(self):
+        """Stop the idle reaper and close every idle session."""
+        self._stopped.set()
+        with self._lock:
+            idle = [s for s in self._sessions.values() if not s.in_use]
+            self._sessions.clear()
+        for session in idle:
+            session.close()
+
+    def _ensure_reaper(self):
+        if self._reaper is None and self.idle_timeout:
+            self._reaper = threading.Thread(target=self._reap, name='connection-pool-reaper', daemon=True)
+            self._reaper.start()
+
+    def _reap(self):
+        interval = max(1, self.idle_timeout / 4)
+        while not self._stopped.wait(interval):
+            self.close_idle()
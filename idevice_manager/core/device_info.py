@@ -0,0 +1,134 @@
+"""
+Device property retrieval.
+
+Lockdown answers GetValue with no key with the whole global value
+dictionary. Everything the app shows is read from that plus one request
+per extra domain, instead of one round-trip per key. pymobiledevice3 keeps
+the handshake's response as lockdown.all_values, which saves the first
+request on a session that was just opened; on a reused (pooled) session
+it is stale, so the values are requested again.
+
+collect_device_info() is the asynchronous info task built on core.aio.
+"""
+
+import asyncio
+
+from .capture import capture_key, capture_visual, frame_image, placeholder_frame
+
+BATTERY_DOMAIN = 'com.apple.mobile.battery'
+DISK_USAGE_DOMAIN = 'com.apple.disk_usage'
+INFO_DOMAINS = (BATTERY_DOMAIN, DISK_USAGE_DOMAIN)
+
+# Global lockdown key -> placeholder used when the device does not report it
+DEFAULT_FIELDS = {
+    'DeviceName': 'Unknown Device',
+    'ProductVersion': 'Unknown Version',
+    'SerialNumber': 'Unknown Serial',
+    'UniqueDeviceID': 'Unknown UDID',
+    'ProductType': 'Unknown Model',
+    'BuildVersion': 'Unknown Build',
+}
+
+
+def fetch_device_values(lockdown, domains=INFO_DOMAINS, handshake_values=False):
+    """Return {domain: values} for the global domain (key None) and domains.
+
+    handshake_values=True takes the global domain from lockdown.all_values
+    instead of asking the device; only pass it for a session that was just
+    opened. A domain the device refuses to answer maps to an empty dict.
+    """
+    values = getattr(lockdown, 'all_values', None) if handshake_values else None
+    values = values or lockdown.get_value()
+    result = {None: dict(values or {})}
+    for domain in domains:
+        try:
+            result[domain] = dict(lockdown.get_value(domain=domain) or {})
+        except Exception:
+            result[domain] = {}
+    return result
+
+
+def summarize(values):
+    """Build the device info dict shown in the GUI from fetch_device_values()."""
+    global_values = values.get(None, {})
+    info = {key: global_values.get(key) or default for key, default in DEFAULT_FIELDS.items()}
+    info['DeviceClass'] = global_values.get('DeviceClass')
+    info['TrustedHostAttached'] = global_values.get('TrustedHostAttached')
+
+    battery = values.get(BATTERY_DOMAIN, {})
+    if battery.get('BatteryCurrentCapacity') is not None:
+        info['BatteryLevel'] = battery['BatteryCurrentCapacity']
+        info['BatteryCharging'] = bool(battery.get('BatteryIsCharging'))
+
+    disk = values.get(DISK_USAGE_DOMAIN, {})
+    if disk.get('TotalDataCapacity'):
+        info['TotalDataCapacity'] = disk['TotalDataCapacity']
+        info['TotalDataAvailable'] = disk.get('TotalDataAvailable')
+    return info
+
+
+def _noop(*args):
+    pass
+
+
+async def collect_device_info(io, session, log=_noop, progress=_noop, capture=True, capture_memory=None):
+    """Fetch properties and a framed picture of a device on a core.aio.DeviceIO.
+
+    session is a core.connections session (udid, lockdown, service()). The
+    property fetch and the capture race (core.capture.capture_visual) start
+    at once; capture_memory is an optional core.capture.CaptureMemory.
+    Returns (info, source) where info['screenshot_image'] holds the framed,
+    display-sized RGBA PIL image (when capture is set; core.capture.encode_png
+    turns it into PNG for storage) and source is the winning capture source,
+    'placeholder' or None.
+    """
+    udid = session.udid
+    fresh = getattr(session, 'fresh', False)
+    # Values go first on the lockdown connection; the service starts queue behind them
+    values_task = asyncio.ensure_future(
+        io.lockdown_call(udid, fetch_device_values, session.lockdown, INFO_DOMAINS, fresh))
+    capture_task = None
+    if capture:
+        log("Capturing device image...")
+        if fresh:
+            # The handshake already gave us ProductType/ProductVersion for the memory key
+            key = capture_key(getattr(session.lockdown, 'all_values', None) or {})
+        else:
+            # A reused session's handshake values may be stale; wait for the current ones
+            key = capture_key((await values_task)[None])
+        capture_task = asyncio.ensure_future(capture_visual(io, session, key, capture_memory, log))
+    try:
+        info = summarize(await values_task)
+    except BaseException:
+        if capture_task is not None:
+            capture_task.cancel()
+        raise
+    progress(60)
+
+    log("Checking device trust and pairing status...")
+    log(f"Device class: {info['DeviceClass']}, iOS: {info['ProductVersion']}")
+    if not info['TrustedHostAttached']:
+        log("[WARNING] Device may not be trusted. Please check 'Trust This Computer' dialog on device.")
+    if capture_task is None:
+        return info, None
+
+    image, source = await capture_task
+    info['screenshot_image'] = None
+    if image:
+        try:
+            info['screenshot_image'] = await io.call(frame_image, image)
+            log("Visual representation captured and framed successfully")
+        except Exception as frame_error:
+            log(f"[WARNING] Could not frame the captured image: {frame_error}")
+    if info['screenshot_image'] is None:
+        log("Creating placeholder device image...")
+        try:
+            info['screenshot_image'] = await io.call(placeholder_frame, info)
+            source = 'placeholder'
+            log("Created iPhone-style device mockup")
+        except Exception as placeholder_error:
+            log(f"[WARNING] Could not create placeholder: {placeholder_error}")
+            source = None
+            log("[WARNING] No visual representation available")
+    progress(75)
+    return info, source
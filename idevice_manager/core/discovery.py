@@ -0,0 +1,149 @@
+"""
+Device discovery through usbmux hotplug events.
+
+DeviceWatcher keeps a usbmux connection in Listen mode on a background
+thread. usbmuxd answers with an Attached message for every device already
+present and then pushes Attached/Detached messages as devices come and go,
+so DeviceRegistry always knows what is connected without a device list
+round-trip per operation. The connection is re-opened if usbmuxd restarts.
+"""
+
+import socket
+import threading
+
+from pymobiledevice3.exceptions import MuxException
+from pymobiledevice3.usbmux import create_mux, list_devices
+
+RECONNECT_DELAY = 2.0
+
+
+class DeviceRegistry:
+    """Live set of attached usbmux devices. Thread-safe.
+
+    live is False until the watcher is listening (and again after usbmuxd
+    goes away); callers should fall back to select_device() then.
+    """
+
+    def __init__(self):
+        self._devices = {}  # usbmux device id -> MuxDevice
+        self._lock = threading.Lock()
+        self.live = False
+
+    def devices(self):
+        with self._lock:
+            return list(self._devices.values())
+
+    def udids(self, connection_type='USB'):
+        """UDIDs of attached devices, USB only by default (None for any transport)."""
+        return _unique_udids(self.devices(), connection_type)
+
+    def select(self, udid=None):
+        """Same choice as usbmux.select_device(): the requested (or any) device, USB first."""
+        candidate = None
+        for device in self.devices():
+            if udid is not None and not device.matches_udid(udid):
+                continue
+            if device.is_usb:
+                return device
+            candidate = candidate or device
+        return candidate
+
+    def _sync(self, devices):
+        """Replace the device set. Returns (attached, detached) lists."""
+        current = {device.devid: device for device in devices}
+        with self._lock:
+            attached = [d for devid, d in current.items() if devid not in self._devices]
+            detached = [d for devid, d in self._devices.items() if devid not in current]
+            self._devices = current
+        return attached, detached
+
+
+def _unique_udids(devices, connection_type):
+    udids = []
+    for device in devices:
+        if connection_type in (None, device.connection_type) and device.serial not in udids:
+            udids.append(device.serial)
+    return udids
+
+
+def attached_udids(connection_type='USB', registry=None):
+    """UDIDs of attached devices, from registry while it is live, else one usbmux device list query."""
+    if registry is not None and registry.live:
+        return registry.udids(connection_type)
+    return _unique_udids(list_devices(), connection_type)
+
+
+class DeviceWatcher:
+    """Background usbmux listener that feeds a DeviceRegistry.
+
+    on_attached/on_detached are called with the MuxDevice from the watcher
+    thread and must not block for long.
+    """
+
+    def __init__(self, registry=None, on_attached=None, on_detached=None, usbmux_address=None):
+        self.registry = registry or DeviceRegistry()
+        self.on_attached = on_attached
+        self.on_detached = on_detached
+        self.usbmux_address = usbmux_address
+        self._mux = None
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='usbmux-watcher', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        mux = self._mux
+        if mux is not None:
+            # close() alone does not wake a thread blocked in recv() on Linux
+            sock = getattr(getattr(mux, '_sock', None), 'sock', None)
+            try:
+                if sock is not None:
+                    sock.shutdown(socket.SHUT_RDWR)
+                mux.close()
+            except OSError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self._mux = create_mux(usbmux_address=self.usbmux_address)
+                self._mux.listen()
+                self.registry.live = True
+                while not self._stopped.is_set():
+                    try:
+                        self._mux.receive_device_state_update()
+                    except MuxException as e:
+                        # Notifications such as "Paired" are read and then rejected;
+                        # any other MuxException means the connection is gone
+                        if 'Invalid packet type' not in str(e):
+                            raise
+                        continue
+                    self._dispatch(*self.registry._sync(self._mux.devices))
+            except Exception:
+                pass
+            finally:
+                self.registry.live = False
+                if self._mux is not None:
+                    try:
+                        self._mux.close()
+                    except OSError:
+                        pass
+                    self._mux = None
+                # Without the listener connection nothing is known to be attached
+                self._dispatch([], self.registry._sync([])[1])
+            self._stopped.wait(RECONNECT_DELAY)
+
+    def _dispatch(self, attached, detached):
+        for device in detached:
+            if self.on_detached:
+                self.on_detached(device)
+        for device in attached:
+            if self.on_attached:
+                self.on_attached(device)
@@ -0,0 +1,197 @@
+"""
+Parallel hashing of acquired backups.
+
+HashingPipeline is a BackupListener: every file the device finishes sending
+is hashed in a process pool while the transfer continues. Concurrent
+backups share one pool, sized to the CPU count; the workers only import
+utils.filehash. finish() then
+walks the snapshot, reuses results whose size and mtime still match and
+hashes whatever was moved or rewritten, and writes an Ed25519-signed
+integrity manifest next to the backup.
+"""
+
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+
+from .backup import BackupListener
+from ..utils.filehash import DEFAULT_ALGORITHMS, hash_file
+from ..utils.paths import app_data_dir
+
+MANIFEST_NAME = 'integrity-manifest.json'
+SIGNATURE_NAME = MANIFEST_NAME + '.sig'
+PUBLIC_KEY_NAME = 'integrity-manifest.pub.pem'
+MANIFEST_VERSION = 1
+
+LEGACY_ALGORITHMS = ('sha256', 'md5', 'sha1')
+
+_pool = None
+_pool_users = 0
+_pool_lock = threading.Lock()
+
+
+def _acquire_pool():
+    """The process pool shared by all open HashingPipelines, started on first use."""
+    global _pool, _pool_users
+    with _pool_lock:
+        if _pool is None:
+            # Forking the GUI's (or CLI's) many threads can deadlock the workers on Linux
+            _pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn'))
+        _pool_users += 1
+        return _pool
+
+
+def _release_pool():
+    """Shut the shared pool down when its last pipeline is done with it."""
+    global _pool, _pool_users
+    with _pool_lock:
+        _pool_users -= 1
+        if _pool_users:
+            return
+        pool, _pool = _pool, None
+    pool.shutdown(wait=True)
+
+
+def _snapshot_files(root):
+    """Relative paths of all files in a snapshot, excluding top-level metadata."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root)
+        if rel_dir == '.':
+            continue
+        for filename in filenames:
+            yield os.path.join(rel_dir, filename).replace(os.sep, '/')
+
+
+class HashingPipeline(BackupListener):
+    """Hashes backup files in worker processes as they arrive.
+
+    The owner must call finish() or close(), also when the backup fails,
+    or the worker processes outlive it.
+    """
+
+    def __init__(self, root, algorithms=DEFAULT_ALGORITHMS):
+        self.root = root
+        self.algorithms = tuple(algorithms)
+        self.executor = _acquire_pool()
+        self.pending = {}  # relative path -> Future
+
+    def on_file_finished(self, file_name, nbytes):
+        rel_path = file_name.replace(os.sep, '/')
+        self.pending[rel_path] = self.executor.submit(
+            hash_file, os.path.join(self.root, file_name), self.algorithms
+        )
+
+    def finish(self, log=None):
+        """Hash anything not yet covered and return the sorted manifest entries."""
+        entries = []
+        futures = {}
+        try:
+            for rel_path in _snapshot_files(self.root):
+                path = os.path.join(self.root, rel_path)
+                early = self.pending.pop(rel_path, None)
+                result = None
+                if early is not None and not early.exception():
+                    result = early.result()
+                    stat = os.stat(path)
+                    if (result[0], result[1]) != (stat.st_size, stat.st_mtime_ns):
+                        result = None
+                futures[rel_path] = result or self.executor.submit(hash_file, path, self.algorithms)
+            if log:
+                log(f"Hashing {len(futures)} files ({', '.join(self.algorithms)})...")
+
+            for rel_path, result in futures.items():
+                size, _, digests = result if isinstance(result, tuple) else result.result()
+                entry = {'path': rel_path, 'size': size}
+                entry.update(digests)
+                entries.append(entry)
+        finally:
+            # e.g. a file vanished: don't leave the rest queued behind the shutdown
+            for result in futures.values():
+                if not isinstance(result, tuple):
+                    result.cancel()
+            self.close()
+        return sorted(entries, key=lambda entry: entry['path'])
+
+    def close(self):
+        for future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+        if self.executor is not None:
+            self.executor = None
+            _release_pool()
+
+
+def signing_key_path():
+    return os.path.join(app_data_dir(), 'manifest_signing_key.pem')
+
+
+def load_signing_key(path=None):
+    """Load the station's Ed25519 signing key, creating it on first use."""
+    path = path or signing_key_path()
+    if os.path.exists(path):
+        with open(path, 'rb') as fd:
+            return serialization.load_pem_private_key(fd.read(), password=None)
+    key = Ed25519PrivateKey.generate()
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'wb') as key_file:
+        key_file.write(key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ))
+    return key
+
+
+def write_manifest(root, entries, algorithms=DEFAULT_ALGORITHMS, key=None):
+    """Write the signed integrity manifest for a snapshot. Returns its path."""
+    key = key or load_signing_key()
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(),
+        'snapshot': os.path.basename(os.path.abspath(root)),
+        'algorithms': list(algorithms),
+        'file_count': len(entries),
+        'total_bytes': sum(entry['size'] for entry in entries),
+        'files': entries,
+    }
+    data = json.dumps(manifest, indent=1).encode('utf-8')
+    manifest_path = os.path.join(root, MANIFEST_NAME)
+    with open(manifest_path, 'wb') as fd:
+        fd.write(data)
+    with open(os.path.join(root, SIGNATURE_NAME), 'wb') as fd:
+        fd.write(key.sign(data).hex().encode('ascii'))
+    with open(os.path.join(root, PUBLIC_KEY_NAME), 'wb') as fd:
+        fd.write(key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        ))
+    return manifest_path
+
+
+def verify_manifest(root, public_key=None):
+    """Check the manifest signature. Returns True if it is valid.
+
+    public_key defaults to the key stored next to the manifest; pass the
+    station's known key to guard against the manifest being re-signed.
+    """
+    with open(os.path.join(root, MANIFEST_NAME), 'rb') as fd:
+        data = fd.read()
+    with open(os.path.join(root, SIGNATURE_NAME), 'rb') as fd:
+        signature = bytes.fromhex(fd.read().decode('ascii'))
+    if public_key is None:
+        with open(os.path.join(root, PUBLIC_KEY_NAME), 'rb') as fd:
+            public_key = serialization.load_pem_public_key(fd.read())
+    if not isinstance(public_key, Ed25519PublicKey):
+        raise ValueError("Integrity manifests are signed with Ed25519 keys")
+    try:
+        public_key.verify(signature, data)
+    except InvalidSignature:
+        return False
+    return True
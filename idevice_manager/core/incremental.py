@@ -0,0 +1,181 @@
+"""
+Incremental backup support.
+
+mobilebackup2 only transfers changed files when the target directory
+already holds the previous snapshot of the device (Status.plist,
+Manifest.db and the hashed file blobs). A new snapshot is seeded from the
+latest finished one by hard linking (or reflinking) its blobs, so
+unchanged files take no extra space and are never copied again.
+
+A seeded folder carries the previous Status.plist, so it looks finished
+even if its own backup fails. Only snapshots with the completion marker
+written by mark_snapshot_complete() are used as seeds.
+"""
+
+import json
+import os
+import plistlib
+import shutil
+import sqlite3
+import sys
+from collections import namedtuple
+from datetime import datetime, timezone
+
+ManifestDiff = namedtuple('ManifestDiff', ['added', 'modified', 'removed', 'unchanged'])
+
+# Linux FICLONE ioctl, used to reflink on btrfs/XFS when hard links fail
+FICLONE = 0x40049409
+
+# Written at the top of a snapshot folder once its backup task succeeded
+COMPLETE_MARKER = 'backup-complete.json'
+
+
+def mark_snapshot_complete(snapshot_path, udid):
+    """Record that the backup of udid into snapshot_path finished successfully."""
+    marker = {'udid': udid, 'completed': datetime.now(timezone.utc).isoformat()}
+    path = os.path.join(snapshot_path, COMPLETE_MARKER)
+    with open(path + '.tmp', 'w', encoding='utf-8') as fd:
+        json.dump(marker, fd)
+    os.replace(path + '.tmp', path)
+
+
+def _snapshot_date(snapshot_path, udid):
+    """Completion date of a finished snapshot of udid, or None if unusable.
+
+    Understands both plain MobileSync folders and thin snapshots that were
+    moved into the content store.
+    """
+    from .store import MANIFEST_NAME, load_manifest, open_store_for
+
+    if not os.path.exists(os.path.join(snapshot_path, COMPLETE_MARKER)):
+        return None
+    device_dir = os.path.join(snapshot_path, udid)
+    try:
+        if os.path.exists(os.path.join(snapshot_path, MANIFEST_NAME)):
+            files = load_manifest(snapshot_path)['files']
+            if f'{udid}/Manifest.db' not in files:
+                return None
+            status_data = open_store_for(snapshot_path).read_object(files[f'{udid}/Status.plist']['sha256'])
+        else:
+            if not os.path.exists(os.path.join(device_dir, 'Manifest.db')):
+                return None
+            with open(os.path.join(device_dir, 'Status.plist'), 'rb') as fd:
+                status_data = fd.read()
+        status = plistlib.loads(status_data)
+    except (OSError, KeyError, ValueError, plistlib.InvalidFileException):
+        return None
+    if status.get('SnapshotState') != 'finished':
+        return None
+    date = status.get('Date')
+    return date.timestamp() if date else os.path.getmtime(snapshot_path)
+
+
+def find_previous_snapshot(backup_directory, udid, exclude=None):
+    """Return the newest finished snapshot folder holding a backup of udid.
+
+    Snapshot folders are the '<device name>_<timestamp>' directories created
+    under backup_directory; each holds the MobileSync '<udid>' folder. Equal
+    completion dates are decided by the (timestamped) folder name.
+    """
+    best_path, best_key = None, None
+    try:
+        entries = list(os.scandir(backup_directory))
+    except OSError:
+        return None
+    for entry in entries:
+        if not entry.is_dir() or (exclude and os.path.abspath(entry.path) == os.path.abspath(exclude)):
+            continue
+        date = _snapshot_date(entry.path, udid)
+        if date is not None and (best_key is None or (date, entry.name) > best_key):
+            best_path, best_key = entry.path, (date, entry.name)
+    return best_path
+
+
+def _reflink(src, dst):
+    import fcntl
+    with open(src, 'rb') as src_fd, open(dst, 'wb') as dst_fd:
+        fcntl.ioctl(dst_fd.fileno(), FICLONE, src_fd.fileno())
+
+
+def link_or_copy(src, dst):
+    """Share src's data with dst as cheaply as the filesystem allows.
+
+    Returns 'link', 'reflink' or 'copy'.
+    """
+    try:
+        os.link(src, dst)
+        return 'link'
+    except OSError:
+        pass
+    if sys.platform.startswith('linux'):
+        try:
+            _reflink(src, dst)
+            return 'reflink'
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+    return 'copy'
+
+
+def seed_snapshot(previous_path, backup_path, udid):
+    """Populate backup_path/<udid> from a previous snapshot of the device.
+
+    Top-level metadata (Info.plist, Status.plist, Manifest.*) is copied
+    because the backup rewrites it in place; file blobs in the hashed
+    sub-directories are linked. Returns a dict of counts per method.
+    """
+    from .store import MANIFEST_NAME, open_store_for
+
+    if os.path.exists(os.path.join(previous_path, MANIFEST_NAME)):
+        return open_store_for(previous_path).rebuild_snapshot(previous_path, backup_path)
+
+    previous_device_dir = os.path.join(previous_path, udid)
+    device_dir = os.path.join(backup_path, udid)
+    counts = {'link': 0, 'reflink': 0, 'copy': 0}
+    os.makedirs(device_dir, exist_ok=True)
+    for entry in os.scandir(previous_device_dir):
+        target = os.path.join(device_dir, entry.name)
+        if entry.is_dir():
+            os.makedirs(target, exist_ok=True)
+            for blob in os.scandir(entry.path):
+                if blob.is_file():
+                    counts[link_or_copy(blob.path, os.path.join(target, blob.name))] += 1
+        elif entry.is_file():
+            shutil.copy2(entry.path, target)
+            counts['copy'] += 1
+    return counts
+
+
+def previous_manifest_db(previous_path, udid):
+    """Path of the Manifest.db of a previous snapshot, or None for thin ones."""
+    path = os.path.join(previous_path, udid, 'Manifest.db')
+    return path if os.path.exists(path) else None
+
+
+def diff_manifests(old_manifest_db, new_manifest_db):
+    """Compare the Files tables of two Manifest.db files.
+
+    Returns None when either manifest cannot be read (e.g. encrypted
+    backups).
+    """
+    try:
+        connection = sqlite3.connect(f"file:{new_manifest_db}?mode=ro", uri=True)
+        try:
+            connection.execute("ATTACH DATABASE ? AS old", (f"file:{old_manifest_db}?mode=ro",))
+            added = connection.execute(
+                "SELECT COUNT(*) FROM main.Files n WHERE NOT EXISTS "
+                "(SELECT 1 FROM old.Files o WHERE o.fileID = n.fileID)"
+            ).fetchone()[0]
+            removed = connection.execute(
+                "SELECT COUNT(*) FROM old.Files o WHERE NOT EXISTS "
+                "(SELECT 1 FROM main.Files n WHERE n.fileID = o.fileID)"
+            ).fetchone()[0]
+            modified, unchanged = connection.execute(
+                "SELECT COALESCE(SUM(n.file IS NOT o.file), 0), COALESCE(SUM(n.file IS o.file), 0) "
+                "FROM main.Files n JOIN old.Files o ON o.fileID = n.fileID"
+            ).fetchone()
+        finally:
+            connection.close()
+    except sqlite3.Error:
+        return None
+    return ManifestDiff(added, modified, removed, unchanged)
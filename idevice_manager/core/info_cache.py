@@ -0,0 +1,148 @@
+"""
+Persistent per-device info cache.
+
+Device properties and the last framed screenshot are kept in memory and
+under the app data directory, keyed by UDID, so the info panel can be
+filled as soon as a known device is found. Every field carries the time it
+was fetched: static fields never expire, volatile ones have a TTL. When a
+device re-attaches (usbmux hands out a new device id) the volatile fields
+are dropped.
+"""
+
+import json
+import os
+import threading
+import time
+
+from ..utils.paths import app_data_dir
+
+CACHE_DIRNAME = 'device-cache'
+CACHE_VERSION = 1
+
+# Fields that cannot change for a given UDID
+STATIC_FIELDS = frozenset(['UniqueDeviceID', 'SerialNumber', 'ProductType', 'DeviceClass', 'TotalDataCapacity'])
+
+# Volatile field -> seconds before it is considered stale
+FIELD_TTLS = {
+    'DeviceName': 3600,
+    'ProductVersion': 6 * 3600,
+    'BuildVersion': 6 * 3600,
+    'TrustedHostAttached': 60,
+    'BatteryLevel': 60,
+    'BatteryCharging': 60,
+    'TotalDataAvailable': 300,
+    'screenshot': 600,
+}
+DEFAULT_TTL = 300
+
+
+def default_cache_root():
+    return os.path.join(app_data_dir(), CACHE_DIRNAME)
+
+
+class DeviceInfoCache:
+    """In-memory and on-disk cache of device info dicts. Thread-safe."""
+
+    def __init__(self, root=None, ttls=None, clock=time.time):
+        self.root = root or default_cache_root()
+        self.ttls = dict(FIELD_TTLS, **(ttls or {}))
+        self.clock = clock
+        self._entries = {}  # udid -> {'connection_id': ..., 'fields': {key: [value, fetched_at]}}
+        self._lock = threading.Lock()
+
+    def _paths(self, udid):
+        safe = "".join(c for c in udid if c.isalnum() or c == '-')
+        return os.path.join(self.root, safe + '.json'), os.path.join(self.root, safe + '.png')
+
+    def _entry(self, udid):
+        """Return the cached entry for udid, loading it from disk once."""
+        if udid not in self._entries:
+            json_path, png_path = self._paths(udid)
+            entry = None
+            try:
+                with open(json_path, 'r', encoding='utf-8') as fd:
+                    entry = json.load(fd)
+                if entry.get('version') != CACHE_VERSION:
+                    entry = None
+                elif 'screenshot' in entry['fields']:
+                    with open(png_path, 'rb') as fd:
+                        entry['fields']['screenshot'][0] = fd.read()
+            except (OSError, ValueError, KeyError):
+                entry = None
+            self._entries[udid] = entry
+        return self._entries[udid]
+
+    def _save(self, udid, entry):
+        os.makedirs(self.root, exist_ok=True)
+        json_path, png_path = self._paths(udid)
+        fields = dict(entry['fields'])
+        screenshot = fields.pop('screenshot', None)
+        if screenshot and screenshot[0]:
+            with open(png_path + '.tmp', 'wb') as fd:
+                fd.write(screenshot[0])
+            os.replace(png_path + '.tmp', png_path)
+            fields['screenshot'] = [None, screenshot[1]]
+        data = {'version': CACHE_VERSION, 'connection_id': entry['connection_id'], 'fields': fields}
+        with open(json_path + '.tmp', 'w', encoding='utf-8') as fd:
+            json.dump(data, fd)
+        os.replace(json_path + '.tmp', json_path)
+
+    def _is_fresh(self, key, fetched_at, now):
+        if key in STATIC_FIELDS:
+            return True
+        return now - fetched_at < self.ttls.get(key, DEFAULT_TTL)
+
+    def get(self, udid):
+        """Return (info, stale_keys) for a known device, or (None, None).
+
+        info holds every cached field, stale or not, so the caller can show
+        it straight away and refresh whatever is listed in stale_keys.
+        """
+        with self._lock:
+            entry = self._entry(udid)
+            if not entry or not entry['fields']:
+                return None, None
+            now = self.clock()
+            info = {key: value for key, (value, _) in entry['fields'].items()}
+            stale = {key for key, (_, fetched_at) in entry['fields'].items()
+                     if not self._is_fresh(key, fetched_at, now)}
+            return info, stale
+
+    def put(self, udid, info, connection_id=None):
+        """Store the fields of info (None values are skipped) and persist them."""
+        with self._lock:
+            entry = self._entry(udid) or {'connection_id': connection_id, 'fields': {}}
+            now = self.clock()
+            for key, value in info.items():
+                if value is not None:
+                    entry['fields'][key] = [value, now]
+            if connection_id is not None:
+                entry['connection_id'] = connection_id
+            self._entries[udid] = entry
+            self._save(udid, entry)
+
+    def invalidate(self, udid, keep_static=True):
+        """Drop volatile fields for udid (or everything when keep_static is False)."""
+        with self._lock:
+            entry = self._entry(udid)
+            if entry:
+                self._drop_fields(udid, entry, keep_static)
+
+    def _drop_fields(self, udid, entry, keep_static=True):
+        entry['fields'] = {key: value for key, value in entry['fields'].items()
+                           if keep_static and key in STATIC_FIELDS}
+        self._save(udid, entry)
+
+    def note_connection(self, udid, connection_id):
+        """Record the usbmux connection id of a device.
+
+        Returns True and invalidates the volatile fields if the device has
+        re-attached since it was last cached.
+        """
+        with self._lock:
+            entry = self._entry(udid)
+            if not entry or connection_id is None or entry['connection_id'] == connection_id:
+                return False
+            entry['connection_id'] = connection_id
+            self._drop_fields(udid, entry)
+            return True
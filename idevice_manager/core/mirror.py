@@ -0,0 +1,183 @@
+"""
+Live screen mirroring through screenshotr.
+
+ScreenMirror pulls screenshots from a device at a target frame rate on a
+core.aio.DeviceIO loop. Frames are decoded and scaled to display size in
+the loop's executor while the next one is being captured, so consumers get
+raw RGBA ready to blit. A frame that arrives while the previous one is
+still being decoded is not displayed, and capture slots the device was too
+slow for are skipped rather than queued: the rate stays steady and memory
+stays flat however long the session runs.
+
+FrameRecorder writes the device's own image data to disk as a numbered
+image sequence on a thread of its own. When the disk falls behind, frames
+are dropped from the recording instead of stalling capture.
+"""
+
+import asyncio
+import io
+import os
+import queue
+import threading
+import time
+from collections import deque, namedtuple
+from datetime import datetime, timezone
+
+from PIL import Image
+from pymobiledevice3.services.screenshot import ScreenshotService
+
+# Largest frame handed to consumers: twice the info panel's 200x400 label
+MIRROR_MAX_SIZE = (400, 800)
+DEFAULT_FPS = 2.0
+MIN_FPS = 0.1
+MAX_FPS = 30.0
+# Session service name; kept apart from the capture race's screenshotr connection
+MIRROR_SERVICE = 'mirror:screenshot'
+RECORDER_MAX_PENDING = 16
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+Frame = namedtuple('Frame', ['index', 'width', 'height', 'rgba', 'captured_at'])
+
+
+def decode_frame(data, max_size=MIRROR_MAX_SIZE):
+    """Return (width, height, RGBA bytes) of screenshot data scaled to fit max_size."""
+    with Image.open(io.BytesIO(data)) as img:
+        img.thumbnail(max_size, Image.Resampling.BILINEAR, reducing_gap=1.0)
+        rgba = img.convert('RGBA')
+    return rgba.width, rgba.height, rgba.tobytes('raw', 'RGBA')
+
+
+class ScreenMirror:
+    """Mirrors one device's screen until the task running run() is cancelled.
+
+    session is a core.connections session. on_frame(Frame) is called on the
+    loop thread for every displayed frame and must not block. fps can be
+    changed while running. recorder is an optional FrameRecorder that gets
+    every captured frame, displayed or not.
+    """
+
+    def __init__(self, io, session, on_frame, fps=DEFAULT_FPS, recorder=None, max_size=MIRROR_MAX_SIZE,
+                 clock=time.monotonic):
+        self.io = io
+        self.session = session
+        self.on_frame = on_frame
+        self.fps = fps
+        self.recorder = recorder
+        self.max_size = max_size
+        self.clock = clock
+
+        self.captured = 0
+        self.displayed = 0
+        self.skipped = 0  # capture slots missed plus frames not displayed
+        self._shown_at = deque(maxlen=30)
+
+    @property
+    def fps(self):
+        return self._fps
+
+    @fps.setter
+    def fps(self, value):
+        self._fps = min(MAX_FPS, max(MIN_FPS, float(value)))
+
+    @property
+    def measured_fps(self):
+        """Displayed frames per second over the last few frames."""
+        if len(self._shown_at) < 2:
+            return 0.0
+        span = self._shown_at[-1] - self._shown_at[0]
+        return (len(self._shown_at) - 1) / span if span > 0 else 0.0
+
+    async def run(self):
+        session = self.session
+        service = await self.io.lockdown_call(session.udid, session.service, MIRROR_SERVICE, ScreenshotService)
+        decoding = None
+        next_due = self.clock()
+        try:
+            while True:
+                data = await self.io.call(service.take_screenshot)
+                captured_at = self.clock()
+                self.captured += 1
+                if self.recorder is not None:
+                    self.recorder.put(data)
+                if decoding is not None and not decoding.done():
+                    # The decoder is behind; a later frame will be shown instead
+                    self.skipped += 1
+                else:
+                    decoding = asyncio.ensure_future(self._show(self.captured, data, captured_at))
+
+                # Stay on the fixed schedule; slots the device was too slow for are dropped
+                interval = 1.0 / self.fps
+                next_due += interval
+                now = self.clock()
+                if now > next_due:
+                    missed = int((now - next_due) / interval) + 1
+                    self.skipped += missed
+                    next_due += missed * interval
+                await asyncio.sleep(next_due - now)
+        finally:
+            if decoding is not None:
+                decoding.cancel()
+            # A cancelled capture leaves the connection mid-request
+            session.discard_service(MIRROR_SERVICE)
+
+    async def _show(self, index, data, captured_at):
+        try:
+            width, height, rgba = await self.io.call(decode_frame, data, self.max_size)
+        except Exception:
+            self.skipped += 1
+            return
+        self.displayed += 1
+        self._shown_at.append(self.clock())
+        self.on_frame(Frame(index, width, height, rgba, captured_at))
+
+
+class FrameRecorder:
+    """Writes frames to directory as frame_000001.png, ... on a background thread.
+
+    put() never blocks: while max_pending frames are waiting for the disk,
+    new ones are dropped from the recording and counted in dropped. The
+    capture time of every written frame goes to frames.csv.
+    """
+
+    def __init__(self, directory, max_pending=RECORDER_MAX_PENDING):
+        self.directory = directory
+        self.written = 0
+        self.dropped = 0
+        self.error = None
+        self._index = 0
+        self._queue = queue.Queue(max_pending)
+        os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name='frame-recorder', daemon=True)
+        self._thread.start()
+
+    def put(self, data):
+        self._index += 1
+        try:
+            self._queue.put_nowait((self._index, data, datetime.now(timezone.utc)))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """Write the frames still queued and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        with open(os.path.join(self.directory, 'frames.csv'), 'w', encoding='utf-8') as index_file:
+            index_file.write("frame,file,captured_utc\n")
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    return
+                index, data, captured = item
+                name = f"frame_{index:06d}{'.png' if data.startswith(PNG_SIGNATURE) else '.tiff'}"
+                try:
+                    with open(os.path.join(self.directory, name), 'wb') as fd:
+                        fd.write(data)
+                    index_file.write(f"{index},{name},{captured.isoformat()}\n")
+                    index_file.flush()
+                except OSError as e:
+                    self.error = e
+                    self.dropped += 1
+                    continue
+                self.written += 1
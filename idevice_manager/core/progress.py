@@ -0,0 +1,121 @@
+"""
+Backup progress accounting.
+
+Turns the raw BackupListener events into BackupProgress snapshots with
+real byte/file counts, instantaneous throughput and an ETA.
+"""
+
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional
+
+from .backup import BackupListener
+
+
+@dataclass(frozen=True)
+class BackupProgress:
+    """Point-in-time view of a running backup.
+
+    Totals are estimated from the device reported percentage and are None
+    until the device has reported any progress.
+    """
+    files_done: int
+    files_total: Optional[int]
+    bytes_done: int
+    bytes_total: Optional[int]
+    current_domain: str
+    percent: float
+    mb_per_sec: float
+    eta_seconds: Optional[float]
+    elapsed: float
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def domain_of(device_name):
+    """Best effort backup domain (e.g. 'HomeDomain') for a device file name."""
+    head = device_name.lstrip('/').split('/', 1)[0]
+    prefix = head.split('-', 1)[0]
+    return prefix if prefix.endswith('Domain') else head
+
+
+class ProgressTracker(BackupListener):
+    """BackupListener that publishes BackupProgress snapshots to a callback.
+
+    Snapshots are rate limited to one per interval seconds; throughput is
+    measured over a sliding window of window seconds.
+    """
+
+    def __init__(self, callback: Callable[[BackupProgress], None], interval=0.25, window=3.0,
+                 clock=time.monotonic):
+        self.callback = callback
+        self.interval = interval
+        self.window = window
+        self.clock = clock
+
+        self.files_done = 0
+        self.bytes_done = 0
+        self.percent = 0.0
+        self.current_domain = ''
+        self._started = clock()
+        self._last_emit = 0.0
+        self._samples = deque()
+
+    def on_progress(self, percent):
+        self.percent = min(max(float(percent), 0.0), 100.0)
+        self._maybe_emit()
+
+    def on_file_started(self, device_name, file_name):
+        self.current_domain = domain_of(device_name)
+
+    def on_file_chunk(self, file_name, nbytes):
+        self.bytes_done += nbytes
+        self._samples.append((self.clock(), self.bytes_done))
+        self._maybe_emit()
+
+    def on_file_finished(self, file_name, nbytes):
+        self.files_done += 1
+        self._maybe_emit()
+
+    def finish(self):
+        """Publish a final snapshot regardless of the rate limit."""
+        self.callback(self.snapshot())
+
+    def snapshot(self):
+        now = self.clock()
+        rate = self._rate(now)
+        files_total = bytes_total = eta = None
+        if self.percent > 0:
+            scale = 100.0 / self.percent
+            files_total = max(self.files_done, int(self.files_done * scale))
+            bytes_total = max(self.bytes_done, int(self.bytes_done * scale))
+            if rate > 0:
+                eta = (bytes_total - self.bytes_done) / rate
+        return BackupProgress(
+            files_done=self.files_done,
+            files_total=files_total,
+            bytes_done=self.bytes_done,
+            bytes_total=bytes_total,
+            current_domain=self.current_domain,
+            percent=self.percent,
+            mb_per_sec=rate / (1024 * 1024),
+            eta_seconds=eta,
+            elapsed=now - self._started,
+        )
+
+    def _rate(self, now):
+        """Bytes per second over the sliding window."""
+        while self._samples and now - self._samples[0][0] > self.window:
+            self._samples.popleft()
+        if len(self._samples) < 2:
+            return 0.0
+        (t0, b0), (t1, b1) = self._samples[0], self._samples[-1]
+        return (b1 - b0) / (t1 - t0) if t1 > t0 else 0.0
+
+    def _maybe_emit(self):
+        now = self.clock()
+        if now - self._last_emit >= self.interval:
+            self._last_emit = now
+            self.callback(self.snapshot())
@@ -0,0 +1,217 @@
+"""
+Content-addressed, deduplicating backup store.
+
+Files of a finished snapshot are linked (or copied) into a shared object
+directory keyed by their SHA-256 digest; once the thin manifest mapping
+relative paths to digests is on disk, the originals are removed.
+Identical files across snapshots and devices are stored once.
+rebuild_snapshot() recreates the standard MobileSync layout on demand.
+
+Usage:
+    python -m idevice_manager.core.store ingest <snapshot folder>
+    python -m idevice_manager.core.store rebuild <snapshot folder> <destination>
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+from .incremental import link_or_copy
+
+STORE_DIRNAME = '.idevice-store'
+MANIFEST_NAME = 'cas-manifest.json'
+MANIFEST_VERSION = 1
+READ_SIZE = 1024 * 1024
+
+
+def file_sha256(path):
+    """SHA-256 hex digest of a file, read in fixed-size blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fd:
+        for block in iter(lambda: fd.read(READ_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def default_store_root(snapshot_path):
+    """Store shared by all snapshots in the same backup directory."""
+    return os.path.join(os.path.dirname(os.path.abspath(snapshot_path)), STORE_DIRNAME)
+
+
+class ContentStore:
+    """Object directory of immutable blobs named by SHA-256."""
+
+    def __init__(self, root):
+        self.root = root
+        self.objects_dir = os.path.join(root, 'objects')
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def add_file(self, path, digest=None):
+        """Link or copy path into the store; path itself is left alone.
+
+        digest may be passed in when the file was already hashed. Safe to
+        call from several ingests sharing the store. Returns
+        (digest, size, stored_new).
+        """
+        digest = digest or file_sha256(path)
+        size = os.path.getsize(path)
+        target = self.object_path(digest)
+        if os.path.exists(target):
+            return digest, size, False
+        object_dir = os.path.dirname(target)
+        os.makedirs(object_dir, exist_ok=True)
+        # A unique name per caller; link_or_copy needs it not to exist
+        fd, tmp_target = tempfile.mkstemp(prefix=f"{digest[:8]}-", suffix='.tmp', dir=object_dir)
+        os.close(fd)
+        os.unlink(tmp_target)
+        try:
+            link_or_copy(path, tmp_target)
+            if os.path.exists(target):
+                # Another ingest stored the same content meanwhile
+                os.unlink(tmp_target)
+                return digest, size, False
+            os.replace(tmp_target, target)
+        except BaseException:
+            try:
+                os.unlink(tmp_target)
+            except OSError:
+                pass
+            raise
+        return digest, size, True
+
+    def ingest_snapshot(self, snapshot_path, known_digests=None):
+        """Replace the files of a snapshot folder with a thin manifest.
+
+        Top-level files (integrity manifests and the like) stay in place.
+        known_digests optionally maps relative paths to SHA-256 digests that
+        were already computed. The originals are only deleted once every file
+        is in the store and the manifest has been written, so a failure
+        partway leaves the snapshot intact. Returns a dict with file, new
+        object and byte counts.
+        """
+        known_digests = known_digests or {}
+        if os.path.exists(os.path.join(snapshot_path, MANIFEST_NAME)):
+            raise ValueError(f"Snapshot already ingested: {snapshot_path}")
+        stats = {'files': 0, 'new_objects': 0, 'bytes': 0, 'deduplicated_bytes': 0}
+        files, dirs, originals = {}, [], []
+        for dirpath, dirnames, filenames in os.walk(snapshot_path):
+            rel_dir = os.path.relpath(dirpath, snapshot_path)
+            if rel_dir != '.':
+                dirs.append(rel_dir.replace(os.sep, '/'))
+            if rel_dir == '.':
+                continue
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                rel_path = os.path.relpath(path, snapshot_path).replace(os.sep, '/')
+                mtime = os.path.getmtime(path)
+                digest, size, stored_new = self.add_file(path, known_digests.get(rel_path))
+                files[rel_path] = {'sha256': digest, 'size': size, 'mtime': mtime}
+                originals.append(path)
+                stats['files'] += 1
+                stats['bytes'] += size
+                if stored_new:
+                    stats['new_objects'] += 1
+                else:
+                    stats['deduplicated_bytes'] += size
+
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'store': os.path.relpath(self.root, snapshot_path),
+            'dirs': sorted(dirs),
+            'files': files,
+        }
+        manifest_path = os.path.join(snapshot_path, MANIFEST_NAME)
+        with open(f"{manifest_path}.tmp", 'w', encoding='utf-8') as fd:
+            json.dump(manifest, fd, separators=(',', ':'))
+            fd.flush()
+            os.fsync(fd.fileno())
+        os.replace(f"{manifest_path}.tmp", manifest_path)
+
+        # Everything is recoverable from the store now; drop the originals, deepest directories last
+        for path in originals:
+            os.unlink(path)
+        for rel_dir in sorted(dirs, key=len, reverse=True):
+            try:
+                os.rmdir(os.path.join(snapshot_path, rel_dir))
+            except OSError:
+                pass
+        return stats
+
+    def rebuild_snapshot(self, snapshot_path, destination):
+        """Recreate the MobileSync layout of a thin snapshot in destination.
+
+        File blobs are hard linked where possible, so the rebuilt tree costs
+        no extra space. Per-device metadata (Info.plist, Manifest.db, ...) is
+        copied because a later backup into the tree rewrites it in place.
+        Returns a dict of counts per method.
+        """
+        manifest = load_manifest(snapshot_path)
+        counts = {'link': 0, 'reflink': 0, 'copy': 0}
+        for rel_dir in manifest['dirs']:
+            os.makedirs(os.path.join(destination, rel_dir), exist_ok=True)
+        for rel_path, entry in manifest['files'].items():
+            source = self.object_path(entry['sha256'])
+            target = os.path.join(destination, rel_path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            if rel_path.count('/') <= 1:
+                shutil.copyfile(source, target)
+                counts['copy'] += 1
+            else:
+                method = link_or_copy(source, target)
+                counts[method] += 1
+                if method == 'link':
+                    continue  # a shared object keeps a single timestamp
+            os.utime(target, (entry['mtime'], entry['mtime']))
+        return counts
+
+    def read_object(self, digest):
+        with open(self.object_path(digest), 'rb') as fd:
+            return fd.read()
+
+
+def load_manifest(snapshot_path):
+    with open(os.path.join(snapshot_path, MANIFEST_NAME), encoding='utf-8') as fd:
+        manifest = json.load(fd)
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported store manifest version: {manifest.get('version')}")
+    return manifest
+
+
+def open_store_for(snapshot_path):
+    """ContentStore a thin snapshot was ingested into."""
+    manifest_path = os.path.join(snapshot_path, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        store = load_manifest(snapshot_path)['store']
+        return ContentStore(os.path.normpath(os.path.join(snapshot_path, store)))
+    return ContentStore(default_store_root(snapshot_path))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m idevice_manager.core.store',
+                                     description='Deduplicating backup store')
+    subparsers = parser.add_subparsers(dest='action', required=True)
+    ingest = subparsers.add_parser('ingest', help='move a snapshot folder into the store')
+    ingest.add_argument('snapshot')
+    rebuild = subparsers.add_parser('rebuild', help='recreate the MobileSync layout of a snapshot')
+    rebuild.add_argument('snapshot')
+    rebuild.add_argument('destination')
+    args = parser.parse_args(argv)
+
+    store = open_store_for(args.snapshot)
+    if args.action == 'ingest':
+        stats = store.ingest_snapshot(args.snapshot)
+        print(json.dumps(stats))
+    else:
+        counts = store.rebuild_snapshot(args.snapshot, args.destination)
+        print(f"Restored {sum(counts.values())} files to {args.destination}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
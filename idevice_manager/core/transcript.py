@@ -0,0 +1,74 @@
+"""
+Backup transcript.
+
+BackupTranscript records every backup event (files received, file errors,
+status messages, progress steps) as a line of text. The full record is
+streamed into a gzip file at the top of the snapshot folder, next to the
+integrity manifest and outside the hashed device tree; only the most
+recent lines stay in memory for error reports. Memory use does not depend
+on the size of the backup.
+"""
+
+import gzip
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+from .backup import BackupListener
+
+TRANSCRIPT_NAME = 'backup-log.txt.gz'
+RECENT_LINES = 200
+
+
+class BackupTranscript(BackupListener):
+    """BackupListener writing a compressed transcript and keeping a ring buffer of recent lines.
+
+    Lines start with the seconds elapsed since the transcript was opened;
+    the absolute start time is in the first line.
+    """
+
+    def __init__(self, path, recent_lines=RECENT_LINES, clock=time.monotonic):
+        self.path = path
+        self.clock = clock
+        self.recent = deque(maxlen=recent_lines)
+        self.line_count = 0
+        self._started = clock()
+        self._percent = None
+        self._fd = gzip.open(path, 'wt', encoding='utf-8')
+        self._fd.write(f"# backup transcript, started {datetime.now(timezone.utc).isoformat()}\n")
+
+    def write(self, text):
+        line = f"{self.clock() - self._started:10.3f} {text}"
+        self.recent.append(line)
+        self.line_count += 1
+        if self._fd is not None:
+            self._fd.write(line + '\n')
+
+    def tail(self, count=20):
+        """The last count lines, oldest first."""
+        return list(self.recent)[-count:]
+
+    def on_progress(self, percent):
+        # One line per whole percent rather than per device update
+        step = int(percent)
+        if step != self._percent:
+            self._percent = step
+            self.write(f"progress {step}%")
+
+    def on_file_finished(self, file_name, nbytes):
+        self.write(f"file {file_name} {nbytes}")
+
+    def on_file_error(self, file_name, message):
+        self.write(f"error {file_name}: {message}")
+
+    def on_log(self, message):
+        self.write(f"log {message}")
+
+    def close(self, status=None):
+        """Record how the backup ended and finish the gzip stream."""
+        if self._fd is None:
+            return
+        if status:
+            self.write(f"end {status}")
+        self._fd.close()
+        self._fd = None
@@ -0,0 +1,32 @@
+"""
+File hashing for the integrity manifest.
+
+This is what core.hashing's worker processes import, so it only uses the
+standard library: a spawned worker does not load pymobiledevice3 or
+cryptography.
+"""
+
+import hashlib
+import mmap
+import os
+
+DEFAULT_ALGORITHMS = ('sha256',)
+
+# Files at least this large are hashed through mmap instead of read()
+MMAP_THRESHOLD = 4 * 1024 * 1024
+
+
+def hash_file(path, algorithms=DEFAULT_ALGORITHMS):
+    """Return (size, mtime_ns, {algorithm: hexdigest}) for one file."""
+    digests = [hashlib.new(name) for name in algorithms]
+    with open(path, 'rb') as fd:
+        stat = os.fstat(fd.fileno())
+        if stat.st_size >= MMAP_THRESHOLD:
+            with mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                for digest in digests:
+                    digest.update(data)
+        elif stat.st_size:
+            data = fd.read()
+            for digest in digests:
+                digest.update(data)
+    return stat.st_size, stat.st_mtime_ns, {name: d.hexdigest() for name, d in zip(algorithms, digests)}
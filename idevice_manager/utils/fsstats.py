@@ -0,0 +1,67 @@
+"""
+Fast directory tree statistics.
+
+Directories are scanned with os.scandir, whose DirEntry objects answer
+is_dir()/is_file() from the directory listing and cache stat() results
+(free on Windows, one syscall on POSIX instead of two). Sub-directories
+are fanned out across a thread pool, which keeps many requests in flight
+on network shares.
+"""
+
+import heapq
+import os
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+TreeStats = namedtuple('TreeStats', ['total_bytes', 'file_count', 'dir_count', 'largest_files'])
+
+
+def _scan_directory(path, top_n):
+    """Scan one directory. Returns (bytes, files, subdirectories, largest)."""
+    total = files = 0
+    subdirs = []
+    largest = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        size = entry.stat(follow_symlinks=False).st_size
+                        total += size
+                        files += 1
+                        if len(largest) < top_n:
+                            heapq.heappush(largest, (size, entry.path))
+                        elif size > largest[0][0]:
+                            heapq.heapreplace(largest, (size, entry.path))
+                except OSError:
+                    pass
+    except OSError:
+        pass
+    return total, files, subdirs, largest
+
+
+def tree_stats(root, max_workers=8, top_n=10):
+    """Return TreeStats for everything below root.
+
+    largest_files is a list of (size, path) tuples, biggest first.
+    """
+    total = files = dirs = 0
+    largest = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(_scan_directory, root, top_n)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                dir_bytes, dir_files, subdirs, dir_largest = future.result()
+                total += dir_bytes
+                files += dir_files
+                dirs += len(subdirs)
+                for item in dir_largest:
+                    if len(largest) < top_n:
+                        heapq.heappush(largest, item)
+                    elif item[0] > largest[0][0]:
+                        heapq.heapreplace(largest, item)
+                pending.update(executor.submit(_scan_directory, subdir, top_n) for subdir in subdirs)
+    return TreeStats(total, files, dirs, sorted(largest, reverse=True))
@@ -6,6 +6,8 @@ This launcher automatically checks and installs dependencies before starting the
 
 import sys
 import os
+import hashlib
+import json
 import subprocess
 import platform
 import threading
@@ -41,7 +43,7 @@ class DependencyInstaller:
         self.venv_path = Path("venv")
         self.requirements = [
             "PyQt6>=6.4.0",
-            "pymobiledevice3>=3.0.0",
+            "pymobiledevice3>=3.0.0,<8",
             "Pillow>=9.0.0",
             "cryptography>=36.0.0",
             "requests>=2.28.0",
@@ -313,42 +315,164 @@ class DependencyInstaller:
         
         return True, "System dependencies installed"
     
-    def install_python_dependencies(self, progress_callback=None):
-        """Install Python dependencies in virtual environment."""
-        venv_python = self.get_venv_python()
+    def get_stamp_path(self):
+        """Install stamp, kept inside the virtual environment it describes."""
+        return self.venv_path / "idevice-manager-stamp.json"
+    
+    def get_fingerprint(self):
+        """What a finished install depends on, one entry per component.
+        
+        Only file metadata is read, no subprocess is started: the hash of the
+        requirement list, the interpreter's path, version and file state, and
+        the virtual environment's config, interpreter and site-packages folder
+        (whose timestamp changes when packages are added or removed).
+        """
+        def file_state(path):
+            try:
+                stat = os.stat(path)
+            except (OSError, TypeError):
+                return "missing"
+            return f"{stat.st_size}:{stat.st_mtime_ns}"
+        
+        interpreter = str(self.python_executable)
+        if not getattr(sys, 'frozen', False):
+            interpreter += f"|{platform.python_version()}"
+        
+        site_packages = sorted(self.venv_path.glob("lib/python*/site-packages")) + \
+            sorted(self.venv_path.glob("Lib/site-packages"))
+        venv_state = [file_state(self.venv_path / "pyvenv.cfg"), file_state(self.get_venv_python())]
+        venv_state += [file_state(path) for path in site_packages]
+        
+        return {
+            "requirements": hashlib.sha256("\n".join(self.requirements).encode("utf-8")).hexdigest(),
+            "python": f"{interpreter}|{file_state(self.python_executable)}",
+            "venv": "|".join(venv_state),
+        }
+    
+    def changed_components(self):
+        """Fingerprint components that differ from the stamp; all of them if there is no stamp."""
+        current = self.get_fingerprint()
+        try:
+            with open(self.get_stamp_path(), encoding="utf-8") as f:
+                recorded = json.load(f)
+        except (OSError, ValueError):
+            recorded = {}
+        if not isinstance(recorded, dict):
+            recorded = {}
+        return {name for name, value in current.items() if recorded.get(name) != value}
+    
+    def is_up_to_date(self):
+        """True when nothing changed since the last successful install."""
+        return not self.changed_components()
+    
+    def write_stamp(self):
+        """Record the current fingerprint after a successful install."""
+        try:
+            with open(self.get_stamp_path(), "w", encoding="utf-8") as f:
+                json.dump(self.get_fingerprint(), f, indent=2)
+        except OSError:
+            pass  # The full checks simply run again next time
+    
+    def find_wheelhouse(self):
+        """Local wheel cache for offline installs, or None to install from the package index.
+
+        IDEVICE_MANAGER_WHEELHOUSE names it explicitly; otherwise a "wheelhouse"
+        folder in the current directory (or next to the frozen launcher) is used
+        when present.
+        """
+        configured = os.environ.get("IDEVICE_MANAGER_WHEELHOUSE")
+        if configured:
+            return Path(configured)
+        candidates = [Path("wheelhouse")]
+        if getattr(sys, 'frozen', False):
+            candidates.append(Path(sys.executable).parent / "wheelhouse")
+        for candidate in candidates:
+            if candidate.is_dir():
+                return candidate
+        return None
+    
+    def get_install_command(self, venv_python, wheelhouse=None):
+        """Command installing packages into the virtual environment, and the backend's name.
+
+        uv is used when it is on PATH (its resolver and parallel downloads are
+        much faster), pip otherwise. IDEVICE_MANAGER_INSTALLER=pip or =uv forces
+        a backend. With a wheelhouse nothing is fetched from the network.
+        Raises ValueError for an unknown backend or a forced uv that is not on PATH.
+        """
+        import shutil
         
-        # Upgrade pip first using python -m pip
-        if progress_callback:
-            progress_callback("Upgrading pip...")
+        backend = os.environ.get("IDEVICE_MANAGER_INSTALLER", "auto").strip().lower() or "auto"
+        if backend not in ("auto", "uv", "pip"):
+            raise ValueError(f"Unknown IDEVICE_MANAGER_INSTALLER value: {backend!r} (use auto, uv or pip)")
+        uv_path = shutil.which("uv") if backend in ("auto", "uv") else None
+        if backend == "uv" and not uv_path:
+            raise ValueError("IDEVICE_MANAGER_INSTALLER=uv, but uv was not found on PATH")
+        if uv_path:
+            command = [uv_path, "pip", "install", "--python", str(venv_python)]
+            if wheelhouse:
+                command += ["--offline", "--no-index", "--find-links", str(wheelhouse)]
+            return "uv", command
+        
+        command = [str(venv_python), "-m", "pip", "install", "--disable-pip-version-check"]
+        if wheelhouse:
+            command += ["--no-index", "--find-links", str(wheelhouse)]
+        return "pip", command
+    
+    def install_python_dependencies(self, progress_callback=None, upgrade_pip=True):
+        """Install Python dependencies in virtual environment.
+        
+        All requirements go to the installer in one call, so the environment is
+        resolved once. upgrade_pip=False skips the pip self-upgrade, which is
+        only worth doing for a new environment.
+        """
+        from collections import deque
+        
+        venv_python = self.get_venv_python()
+        wheelhouse = self.find_wheelhouse()
+        if wheelhouse is not None and not wheelhouse.is_dir():
+            return False, f"Wheelhouse not found: {wheelhouse}"
         try:
-            # Hide console window on Windows
-            kwargs = {}
-            if self.is_windows:
-                kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
-            
-            subprocess.run([str(venv_python), "-m", "pip", "install", "--upgrade", "pip"], 
-                         capture_output=True, check=True, **kwargs)
-        except subprocess.CalledProcessError:
-            pass  # Continue even if pip upgrade fails
+            backend, command = self.get_install_command(venv_python, wheelhouse)
+        except ValueError as e:
+            return False, str(e)
         
-        # Install each requirement using python -m pip
-        for i, requirement in enumerate(self.requirements, 1):
-            package_name = requirement.split(">=")[0]
+        # Hide console window on Windows
+        kwargs = {}
+        if self.is_windows:
+            kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
+        
+        # Upgrade pip first using python -m pip (needs the package index; uv does not use pip)
+        if upgrade_pip and backend == "pip" and wheelhouse is None:
             if progress_callback:
-                progress_callback(f"Installing {package_name} ({i}/{len(self.requirements)})...")
-            
+                progress_callback("Upgrading pip...")
             try:
-                # Hide console window on Windows
-                kwargs = {}
-                if self.is_windows:
-                    kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
-                
-                result = subprocess.run([str(venv_python), "-m", "pip", "install", requirement], 
-                                      capture_output=True, text=True, **kwargs)
-                if result.returncode != 0:
-                    return False, f"Failed to install {requirement}: {result.stderr}"
-            except subprocess.CalledProcessError as e:
-                return False, f"Failed to install {requirement}: {e}"
+                subprocess.run([str(venv_python), "-m", "pip", "install", "--upgrade", "pip"], 
+                             capture_output=True, check=True, **kwargs)
+            except subprocess.CalledProcessError:
+                pass  # Continue even if pip upgrade fails
+        
+        if progress_callback:
+            source = f"wheelhouse {wheelhouse}" if wheelhouse else "the package index"
+            progress_callback(f"Installing {len(self.requirements)} packages with {backend} from {source}...")
+        
+        # Pass on the installer's milestones as they happen; keep the tail for errors
+        milestones = ("Collecting", "Installing collected", "Successfully installed",
+                      "Resolved", "Prepared", "Installed", "Audited")
+        recent = deque(maxlen=20)
+        try:
+            process = subprocess.Popen(command + self.requirements, stdout=subprocess.PIPE,
+                                       stderr=subprocess.STDOUT, text=True, **kwargs)
+            for line in process.stdout:
+                line = line.rstrip()
+                recent.append(line)
+                if progress_callback and line.lstrip().startswith(milestones):
+                    progress_callback(line.strip())
+            returncode = process.wait()
+        except OSError as e:
+            return False, f"Failed to run {backend}: {e}"
+        
+        if returncode != 0:
+            return False, f"Failed to install dependencies with {backend}:\n" + "\n".join(recent)
         
         return True, "All Python dependencies installed successfully"
     
@@ -357,23 +481,30 @@ class DependencyInstaller:
         venv_python = self.get_venv_python()
         
         test_modules = ["PyQt6", "pymobiledevice3", "PIL"]
-        
-        for module in test_modules:
-            if progress_callback:
-                progress_callback(f"Testing {module} import...")
+        if progress_callback:
+            progress_callback(f"Testing {', '.join(test_modules)} imports...")
+        
+        # One interpreter start for all modules; the failing one is named on stderr
+        script = (
+            "import importlib, sys\n"
+            f"for name in {test_modules!r}:\n"
+            "    try:\n"
+            "        importlib.import_module(name)\n"
+            "    except Exception as e:\n"
+            "        sys.exit(f'Failed to import {name}: {e}')\n"
+        )
+        try:
+            # Hide console window on Windows
+            kwargs = {}
+            if self.is_windows:
+                kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
             
-            try:
-                # Hide console window on Windows
-                kwargs = {}
-                if self.is_windows:
-                    kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
-                
-                result = subprocess.run([str(venv_python), "-c", f"import {module}"], 
-                                      capture_output=True, text=True, **kwargs)
-                if result.returncode != 0:
-                    return False, f"Failed to import {module}: {result.stderr}"
-            except subprocess.CalledProcessError as e:
-                return False, f"Failed to import {module}: {e}"
+            result = subprocess.run([str(venv_python), "-c", script], 
+                                  capture_output=True, text=True, **kwargs)
+            if result.returncode != 0:
+                return False, result.stderr.strip() or f"Import test failed with code {result.returncode}"
+        except OSError as e:
+            return False, f"Failed to run import test: {e}"
         
         return True, "All imports successful"
     
@@ -461,8 +592,8 @@ class DependencyInstaller:
             return False, f"Failed to launch application: {e}"
 
 class InstallerGUI:
-    def __init__(self):
-        self.installer = DependencyInstaller()
+    def __init__(self, installer=None):
+        self.installer = installer or DependencyInstaller()
         self.setup_gui()
         
     def setup_gui(self):
@@ -595,6 +726,10 @@ class InstallerGUI:
     def run_installation(self):
         """Run the complete installation process."""
         try:
+            # Only what changed since the last install is redone; a reinstall redoes everything
+            changed = self.installer.changed_components() or {"python", "venv", "requirements"}
+            self.log_message(f"Changed since last install: {', '.join(sorted(changed))}")
+            
             # Step 0: Ensure Python is available (5%)
             self.update_status("Ensuring Python is available...", 5)
             self.log_message("Checking for Python installation...")
@@ -616,14 +751,15 @@ class InstallerGUI:
                 return
             
             # Step 2: Check pip (25%)
-            self.update_status("Checking pip availability...", 25)
-            self.log_message("Checking pip availability...")
-            
-            success, message = self.installer.check_pip_available()
-            self.log_message(message)
-            if not success:
-                self.installation_failed(message)
-                return
+            if "python" in changed:
+                self.update_status("Checking pip availability...", 25)
+                self.log_message("Checking pip availability...")
+                
+                success, message = self.installer.check_pip_available()
+                self.log_message(message)
+                if not success:
+                    self.installation_failed(message)
+                    return
             
             # Step 3: Create virtual environment (35%)
             self.update_status("Creating virtual environment...", 35)
@@ -636,7 +772,7 @@ class InstallerGUI:
                 return
             
             # Step 4: Install system dependencies (macOS only) (45%)
-            if self.installer.is_macos:
+            if self.installer.is_macos and "venv" in changed:
                 self.update_status("Installing system dependencies...", 45)
                 self.log_message("Installing system dependencies (macOS)...")
                 
@@ -650,7 +786,7 @@ class InstallerGUI:
             self.log_message("Installing Python dependencies...")
             
             success, message = self.installer.install_python_dependencies(
-                progress_callback=self.log_message)
+                progress_callback=self.log_message, upgrade_pip="venv" in changed)
             if not success:
                 self.installation_failed(message)
                 return
@@ -666,6 +802,7 @@ class InstallerGUI:
                 return
             
             # Step 7: Complete (100%)
+            self.installer.write_stamp()
             self.update_status("Installation completed successfully!", 100)
             self.log_message("Installation completed successfully!")
             self.log_message("You can now launch the iDevice Manager application.")
@@ -736,19 +873,23 @@ class InstallerGUI:
         
         self.root.mainloop()
 
-def console_installer():
+def console_installer(installer=None):
     """Fallback console-based installer if GUI is not available."""
     print("=" * 60)
     print("          iDevice Manager - Console Installer")
     print("=" * 60)
     print()
     
-    installer = DependencyInstaller()
+    installer = installer or DependencyInstaller()
     
     def console_progress(message):
         print(f"  {message}")
     
     try:
+        # Only what changed since the last install is redone
+        changed = installer.changed_components() or {"python", "venv", "requirements"}
+        print(f"Changed since last install: {', '.join(sorted(changed))}")
+        
         # Ensure Python is available
         print("Ensuring Python is available...")
         success, message = installer.ensure_python_available(console_progress)
@@ -765,12 +906,13 @@ def console_installer():
             return False
         
         # Check pip
-        print("Checking pip...")
-        success, message = installer.check_pip_available()
-        console_progress(message)
-        if not success:
-            print(f"ERROR: {message}")
-            return False
+        if "python" in changed:
+            print("Checking pip...")
+            success, message = installer.check_pip_available()
+            console_progress(message)
+            if not success:
+                print(f"ERROR: {message}")
+                return False
         
         # Create virtual environment
         print("Creating virtual environment...")
@@ -780,7 +922,7 @@ def console_installer():
             return False
         
         # Install system dependencies (macOS)
-        if installer.is_macos:
+        if installer.is_macos and "venv" in changed:
             print("Installing system dependencies...")
             success, message = installer.install_system_dependencies_macos(console_progress)
             if not success:
@@ -788,7 +930,7 @@ def console_installer():
         
         # Install Python dependencies
         print("Installing Python dependencies...")
-        success, message = installer.install_python_dependencies(console_progress)
+        success, message = installer.install_python_dependencies(console_progress, upgrade_pip="venv" in changed)
         if not success:
             print(f"ERROR: {message}")
             return False
@@ -800,6 +942,8 @@ def console_installer():
             print(f"ERROR: {message}")
             return False
         
+        installer.write_stamp()
+        
         print()
         print("=" * 60)
         print("          Installation completed successfully!")
@@ -843,20 +987,30 @@ def console_installer():
 def main():
     """Main entry point."""
     print("iDevice Manager - Auto Installer")
+    installer = DependencyInstaller()
+    
+    # Nothing changed since the last successful install: no checks, no installer window
+    if installer.is_up_to_date() and installer.check_main_app_exists():
+        print("Environment unchanged since the last install - launching...")
+        success, message = installer.launch_main_app()
+        if success:
+            return
+        print(f"Failed to launch: {message}")
+    
     print("Checking for GUI support...")
     
     if TKINTER_AVAILABLE:
         print("GUI mode available - starting graphical installer...")
         try:
-            app = InstallerGUI()
+            app = InstallerGUI(installer)
             app.run()
         except Exception as e:
             print(f"GUI failed: {e}")
             print("Falling back to console mode...")
-            console_installer()
+            console_installer(installer)
     else:
         print("GUI not available - using console mode...")
-        console_installer()
+        console_installer(installer)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""
+License text and acceptance record
+
+The GPL text ships as a package resource (resources/LICENSE.txt) and is
+read only when the license dialog is shown. Acceptance is recorded per
+user and per application version in the app data directory, so the dialog
+comes up once after each install or upgrade instead of on every launch.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+
+from .. import __version__
+from .paths import app_data_dir
+
+LICENSE_RESOURCE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "resources", "LICENSE.txt")
+ACCEPTANCE_FILENAME = "license-acceptance.json"
+LICENSE_URL = "https://www.gnu.org/licenses/gpl-3.0.txt"
+
+
+def license_text():
+    """The full license text, read from the package resource."""
+    try:
+        with open(LICENSE_RESOURCE, encoding="utf-8") as fd:
+            return fd.read()
+    except OSError:
+        return ("This program is licensed under the GNU General Public License, version 3.\n\n"
+                f"The license text was not found in this installation; see {LICENSE_URL}")
+
+
+def _acceptance_path():
+    return os.path.join(app_data_dir(), ACCEPTANCE_FILENAME)
+
+
+def _load_acceptances():
+    try:
+        with open(_acceptance_path(), encoding="utf-8") as fd:
+            accepted = json.load(fd).get("accepted")
+    except (OSError, ValueError, AttributeError):
+        return {}
+    return accepted if isinstance(accepted, dict) else {}
+
+
+def license_accepted(version=__version__):
+    """Whether this user has accepted the license for this version."""
+    return version in _load_acceptances()
+
+
+def record_acceptance(version=__version__):
+    """Remember that this user accepted the license for version.
+
+    Failing to write is not an error; the dialog is shown again next time.
+    """
+    accepted = _load_acceptances()
+    accepted[version] = datetime.now(timezone.utc).isoformat()
+    try:
+        # app_data_dir() creates the folder, which fails on an unwritable profile too
+        path = _acceptance_path()
+        with open(path + ".tmp", "w", encoding="utf-8") as fd:
+            json.dump({"accepted": accepted}, fd, indent=2)
+        os.replace(path + ".tmp", path)
+    except OSError:
+        pass
@@ -0,0 +1,148 @@
+"""
+Batched log sink
+
+Workers hand log messages to LogSink.write() from their own threads; the
+call only appends to a buffer. The GUI drains the buffer on a timer with
+flush(), which formats the whole batch and appends it to a size-rotated
+log file in one go, so a chatty backup costs one widget update per tick
+instead of one per line.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+from .paths import app_data_dir
+
+LOG_FILENAME = "idevice-manager.log"
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 3
+
+# (substrings of the lower-cased message, icon); first match wins
+_ICONS = (
+    (("successfully", "completed"), "✅"),
+    (("starting", "attempting"), "🔄"),
+    (("found device",), "📱"),
+    (("connecting", "establishing"), "🔗"),
+)
+
+
+def default_log_path():
+    return os.path.join(app_data_dir(), "logs", LOG_FILENAME)
+
+
+def message_icon(message):
+    """Icon the log view shows in front of a message."""
+    if message.startswith("[ERROR]"):
+        return "🔴"
+    if message.startswith("[WARNING]"):
+        return "🟡"
+    lowered = message.lower()
+    for needles, icon in _ICONS:
+        if any(needle in lowered for needle in needles):
+            return icon
+    return "ℹ️ "
+
+
+class RotatingLogFile:
+    """Append-only text file rotated to path.1 ... path.N once it exceeds max_bytes."""
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES, backup_count=DEFAULT_BACKUP_COUNT):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._fd = None
+
+    def _open(self):
+        if self._fd is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._fd = open(self.path, 'a', encoding='utf-8')
+        return self._fd
+
+    def write(self, text):
+        fd = self._open()
+        fd.write(text)
+        fd.flush()
+        if fd.tell() >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        self.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def close(self):
+        if self._fd is not None:
+            self._fd.close()
+            self._fd = None
+
+
+class LogSink:
+    """Thread-safe log buffer drained in batches by flush().
+
+    With a log_file (a RotatingLogFile) every flushed line is also written
+    there, full date included.
+    """
+
+    def __init__(self, log_file=None, clock=time.time):
+        self.log_file = log_file
+        self.clock = clock
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._stamp_second = None
+        self._stamps = None
+
+    def write(self, message):
+        """Queue a message; safe to call from any thread."""
+        self._pending.append((self.clock(), message))
+
+    def _timestamps(self, when):
+        # strftime once per second instead of once per line
+        second = int(when)
+        if second != self._stamp_second:
+            local = time.localtime(second)
+            self._stamp_second = second
+            self._stamps = (time.strftime("%H:%M:%S", local), time.strftime("%Y-%m-%d %H:%M:%S", local))
+        return self._stamps
+
+    def flush(self, max_lines=None):
+        """Format and return the queued lines for display, writing them to the log file.
+
+        With max_lines only the newest max_lines are returned, after a line
+        saying how many were left out; the log file still gets every line.
+        """
+        with self._lock:
+            batch = []
+            while self._pending:
+                batch.append(self._pending.popleft())
+            if not batch:
+                return []
+            if self.log_file is not None:
+                file_lines = []
+                for when, message in batch:
+                    file_lines.append(f"{self._timestamps(when)[1]} | {message}\n")
+                try:
+                    self.log_file.write("".join(file_lines))
+                except OSError:
+                    # The log view matters more than the file; keep going without it
+                    self.log_file = None
+            lines = []
+            if max_lines is not None and len(batch) > max_lines:
+                lines.append(f"ℹ️  {self._timestamps(batch[0][0])[0]} | "
+                             f"... {len(batch) - max_lines} lines only in the log file ...")
+                batch = batch[-max_lines:]
+            for when, message in batch:
+                lines.append(f"{message_icon(message)} {self._timestamps(when)[0]} | {message}")
+            return lines
+
+    def close(self):
+        self.flush()
+        if self.log_file is not None:
+            self.log_file.close()
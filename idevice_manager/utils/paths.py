@@ -0,0 +1,22 @@
+"""
+Per-user application paths
+"""
+
+import os
+import sys
+
+APP_NAME = "iDevice Manager"
+
+
+def app_data_dir():
+    """Directory for per-user state (keys, caches, settings); created on demand."""
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA") or os.path.expanduser("~")
+        path = os.path.join(base, APP_NAME)
+    elif sys.platform == "darwin":
+        path = os.path.join(os.path.expanduser("~/Library/Application Support"), APP_NAME)
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+        path = os.path.join(base, "idevice-manager")
+    os.makedirs(path, exist_ok=True)
+    return path
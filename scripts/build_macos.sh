@@ -92,6 +92,8 @@ pyinstaller --onefile \
     --workpath build \
     --specpath build \
     --osx-bundle-identifier "com.idevicemanager.app" \
+    --paths . \
+    --add-data "$(pwd)/idevice_manager/resources:idevice_manager/resources" \
     idevice_manager/main.py
 
 if [ $? -ne 0 ]; then
@@ -100,6 +100,8 @@ pyinstaller --onefile ^
     --distpath dist ^
     --workpath build ^
     --specpath build ^
+    --paths . ^
+    --add-data "%CD%\idevice_manager\resources;idevice_manager\resources" ^
     idevice_manager\main.py
 
 if errorlevel 1 (
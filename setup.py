@@ -43,8 +43,10 @@ setup(
     entry_points={
         "console_scripts": [
             "idevice-manager=idevice_manager.main:main",
+            "idevice-manager-cli=idevice_manager.cli:main",
         ],
     },
+    package_data={"idevice_manager": ["resources/*.txt"]},
     include_package_data=True,
     zip_safe=False,
 )
\ No newline at end of file